@@ -10,32 +10,41 @@ from __future__ import annotations
 
 import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from typing import Any
 
-from core.config import SCHEMA_CACHE_FILE
+from core.schema_cache import save_schema_cache
 from core.state import AgentState
 
+try:
+    import orjson
+except ImportError:  # stdlib fallback
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 
-def _write_json(db_name: str, content: dict) -> str:
+def _render_json(db_name: str, content: dict) -> tuple[Path, bytes]:
     from datetime import datetime
     from core.config import OUTPUTS_DIR
 
     filename = f"{db_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-    path = OUTPUTS_DIR / filename
-    path.write_text(json.dumps(content, indent=2, default=str), encoding="utf-8")
-    logger.info("JSON artifact: %s", path)
-    return str(path)
+    if orjson is not None:
+        data = orjson.dumps(content, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    else:
+        data = json.dumps(content, indent=2, default=str).encode("utf-8")
+    return OUTPUTS_DIR / filename, data
 
 
-def _write_markdown(db_name: str, schema: dict, quality: dict, docs: dict) -> str:
+def _render_markdown(db_name: str, schema: dict, quality: dict, docs: dict) -> tuple[Path, bytes]:
     from datetime import datetime
     from core.config import OUTPUTS_DIR
 
+    now = datetime.now()
     lines: list[str] = [
         f"# Data Dictionary: {db_name}",
-        f"\n_Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}_\n",
+        f"\n_Generated: {now:%Y-%m-%d %H:%M:%S}_\n",
         "---\n",
         "## Table of Contents\n",
     ]
@@ -145,11 +154,28 @@ def _write_markdown(db_name: str, schema: dict, quality: dict, docs: dict) -> st
 
         lines.append("---\n")
 
-    filename = f"{db_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.md"
-    path = OUTPUTS_DIR / filename
-    path.write_text("\n".join(lines), encoding="utf-8")
-    logger.info("Markdown artifact: %s", path)
-    return str(path)
+    filename = f"{db_name}_{now:%Y%m%d_%H%M%S}.md"
+    return OUTPUTS_DIR / filename, "\n".join(lines).encode("utf-8")
+
+
+def _write_files(files: list[tuple[Path, bytes]]) -> list[Exception | None]:
+    """
+    Write pre-rendered files as one concurrent batch.
+
+    Returns one entry per file: None on success, else the raised exception.
+    """
+    def _write(item: tuple[Path, bytes]) -> Exception | None:
+        path, data = item
+        try:
+            path.write_bytes(data)
+        except Exception as exc:
+            return exc
+        return None
+
+    if not files:
+        return []
+    with ThreadPoolExecutor(max_workers=len(files)) as pool:
+        return list(pool.map(_write, files))
 
 
 def export_agent_node(state: AgentState) -> dict[str, Any]:
@@ -173,26 +199,33 @@ def export_agent_node(state: AgentState) -> dict[str, Any]:
 
     errors: list[str] = list(state.get("errors", []))
 
+    # Render everything in memory first, then hand the files to the OS together.
+    pending: list[tuple[str, Path, bytes]] = []
+
     try:
-        json_path = _write_json(db_name, full_content)
-        artifacts.append(json_path)
+        pending.append(("JSON", *_render_json(db_name, full_content)))
     except Exception as exc:
         logger.error("Export Agent JSON write failed: %s", exc)
         errors.append(f"ExportAgent JSON error: {exc}")
 
     try:
-        md_path = _write_markdown(db_name, schema, quality, docs)
-        artifacts.append(md_path)
+        pending.append(("Markdown", *_render_markdown(db_name, schema, quality, docs)))
     except Exception as exc:
         logger.error("Export Agent Markdown write failed: %s", exc)
         errors.append(f"ExportAgent Markdown error: {exc}")
 
-    # Persist schema cache for incremental updates
+    outcomes = _write_files([(path, data) for _, path, data in pending])
+    for (kind, path, _), exc in zip(pending, outcomes):
+        if exc is None:
+            logger.info("%s artifact: %s", kind, path)
+            artifacts.append(str(path))
+        else:
+            logger.error("Export Agent %s write failed: %s", kind, exc)
+            errors.append(f"ExportAgent {kind} error: {exc}")
+
+    # Persist schema cache for incremental updates; only changed tables are rewritten
     try:
-        SCHEMA_CACHE_FILE.write_text(
-            json.dumps(schema, indent=2, default=str), encoding="utf-8"
-        )
-        logger.info("Schema cache updated: %s", SCHEMA_CACHE_FILE)
+        save_schema_cache(schema)
     except Exception as exc:
         logger.warning("Failed to update schema cache: %s", exc)
 
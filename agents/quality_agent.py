@@ -18,7 +18,7 @@ from langgraph.prebuilt import create_react_agent
 
 from core.config import GEMINI_MODEL, GOOGLE_API_KEY
 from core.state import AgentState, extract_message_content
-from tools.quality_tools import QUALITY_TOOLS
+from tools.quality_tools import MAX_PARALLEL_QUERIES, QUALITY_TOOLS, shared_connection
 from tools.schema_tools import get_columns
 
 logger = logging.getLogger(__name__)
@@ -29,7 +29,9 @@ Your sole responsibility is to perform thorough data quality analysis on each ta
 
 For each table provided to you, you MUST:
 1. Call `compute_table_completeness` to get overall completeness and per-column null rates.
-2. For each column, call `analyze_column_stats` to get distinct count, min, max, mean, stddev.
+2. Call `analyze_table_profile` once per table to get null count, distinct count, min, max,
+   mean and stddev for every column in a single scan (use `analyze_column_stats` only to
+   re-check a single column).
 3. If the table has a primary key, call `check_pk_uniqueness` with those PK columns.
 4. If you detect any timestamp/date column (names like created_at, updated_at, date, timestamp),
    call `check_freshness` using that column.
@@ -113,9 +115,15 @@ def quality_agent_node(state: AgentState) -> dict[str, Any]:
     )
 
     try:
-        result = agent.invoke(
-            {"messages": [SystemMessage(content=_SYSTEM_PROMPT), user_message]}
-        )
+        # Tool calls run on ToolNode's executor threads; each thread keeps one
+        # connection for the whole run instead of checking one out per call.
+        # max_concurrency bounds the threads, and so the connections held,
+        # to the pool's budget.
+        with shared_connection(db_config):
+            result = agent.invoke(
+                {"messages": [SystemMessage(content=_SYSTEM_PROMPT), user_message]},
+                config={"max_concurrency": MAX_PARALLEL_QUERIES},
+            )
         final_content = extract_message_content(result["messages"][-1].content)
         cleaned = final_content.strip()
         if cleaned.startswith("```"):
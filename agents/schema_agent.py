@@ -20,7 +20,9 @@ from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langgraph.prebuilt import create_react_agent
 
-from core.config import GEMINI_MODEL, GOOGLE_API_KEY, SCHEMA_CACHE_FILE
+from core.config import GEMINI_MODEL, GOOGLE_API_KEY
+from core.db_connectors import clear_reflection_cache, get_engine
+from core.schema_cache import load_schema_cache
 from core.state import AgentState, extract_message_content
 from tools.schema_tools import SCHEMA_TOOLS
 
@@ -33,11 +35,13 @@ Your sole responsibility is to extract COMPLETE schema metadata from the connect
 Steps you MUST follow:
 1. Call `list_all_schemas` to discover all non-system schemas.
 2. For each schema, call `list_tables` to get all tables.
-3. For every table, call:
-   a. `get_columns` – column names, types, nullability, defaults, PK membership
-   b. `get_foreign_keys` – FK references
-   c. `get_constraints` – PKs, unique constraints, check constraints, indexes
-   d. `get_table_row_count` – approximate row count
+3. For every table, call `describe_table`, which returns in one call:
+   a. `columns` – column names, types, nullability, defaults, PK membership
+   b. `foreign_keys` – FK references
+   c. `constraints` – PKs, unique constraints, check constraints, indexes
+   d. `row_count` – approximate row count
+   (`get_columns`, `get_foreign_keys`, `get_constraints` and
+   `get_table_row_count` remain available for single lookups.)
 4. Compile everything into a single JSON object keyed by "schema.table_name".
 
 When done, output ONLY valid JSON in this exact structure (no markdown, no prose):
@@ -71,12 +75,10 @@ def _schema_hash(schema: dict) -> str:
 
 
 def _load_cached_schema() -> dict | None:
-    if SCHEMA_CACHE_FILE.exists():
-        try:
-            return json.loads(SCHEMA_CACHE_FILE.read_text(encoding="utf-8"))
-        except Exception:
-            return None
-    return None
+    try:
+        return load_schema_cache()
+    except Exception:
+        return None
 
 
 def schema_agent_node(state: AgentState) -> dict[str, Any]:
@@ -85,6 +87,8 @@ def schema_agent_node(state: AgentState) -> dict[str, Any]:
 
     db_config = state.get("db_config", {})
     db_config_json = json.dumps(db_config)
+    # Reflect the live catalog each run so incremental runs see new DDL.
+    clear_reflection_cache(get_engine(db_config))
 
     llm = _build_llm()
     agent = create_react_agent(llm, SCHEMA_TOOLS)
@@ -21,7 +21,12 @@ BASE_DIR: Path = Path(__file__).resolve().parent.parent
 OUTPUTS_DIR: Path = BASE_DIR / os.environ.get("OUTPUTS_DIR", "outputs")
 OUTPUTS_DIR.mkdir(parents=True, exist_ok=True)
 
-SCHEMA_CACHE_FILE: Path = OUTPUTS_DIR / "schema_cache.json"
+SCHEMA_CACHE_FILE: Path = OUTPUTS_DIR / "schema_cache.json"  # legacy single-file snapshot
+SCHEMA_CACHE_DIR: Path = OUTPUTS_DIR / "schema_cache"
+
+# Quality tools: seconds an identical repeated tool call is answered from
+# memory instead of the database (0 disables)
+TOOL_RESULT_TTL: int = int(os.environ.get("TOOL_RESULT_TTL", "60"))
 
 # Logging
 LOG_LEVEL: str = os.environ.get("LOG_LEVEL", "INFO")
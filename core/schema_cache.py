@@ -0,0 +1,117 @@
+"""
+On-disk schema snapshot used for incremental update detection.
+
+The snapshot is split into one JSON file per table under SCHEMA_CACHE_DIR
+plus a manifest.json mapping table name → {"file", "hash"}. A write only
+touches tables whose serialized form changed, so re-running the pipeline
+against a mostly-stable database rewrites a few small files instead of the
+whole cache.
+
+Usage:
+    changed = save_schema_cache(schema)   # → True if anything was rewritten
+    schema = load_schema_cache()          # → dict, or None if no snapshot
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import re
+from pathlib import Path
+
+from core.config import SCHEMA_CACHE_DIR, SCHEMA_CACHE_FILE
+
+try:
+    import orjson
+except ImportError:  # stdlib fallback
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "manifest.json"
+
+_UNSAFE_CHARS = re.compile(r"[^\w.-]")
+
+
+def _encode(obj) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, indent=2, default=str, ensure_ascii=False).encode("utf-8")
+
+
+def _digest(payload: bytes) -> str:
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+def _table_file(table_name: str) -> str:
+    # Sanitized name for readability plus a name hash so distinct tables never collide.
+    safe = _UNSAFE_CHARS.sub("_", table_name)[:64]
+    return f"{safe}-{_digest(table_name.encode('utf-8'))[:8]}.json"
+
+
+def _read_manifest(cache_dir: Path) -> dict[str, dict[str, str]]:
+    try:
+        return json.loads((cache_dir / MANIFEST_NAME).read_bytes())
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def save_schema_cache(schema: dict, cache_dir: Path = SCHEMA_CACHE_DIR) -> bool:
+    """
+    Persist schema as per-table files, skipping tables whose content is unchanged.
+
+    Files for tables no longer in schema are removed. Returns True if any
+    table file or the manifest changed.
+    """
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    old = _read_manifest(cache_dir)
+    new: dict[str, dict[str, str]] = {}
+    written = 0
+
+    for table_name, table_schema in schema.items():
+        name = str(table_name)
+        payload = _encode(table_schema)
+        entry = {"file": _table_file(name), "hash": _digest(payload)}
+        new[name] = entry
+        if old.get(name) == entry and (cache_dir / entry["file"]).exists():
+            continue
+        (cache_dir / entry["file"]).write_bytes(payload)
+        written += 1
+
+    live_files = {e["file"] for e in new.values()}
+    for name, entry in old.items():
+        if name not in new and entry.get("file") not in live_files:
+            try:
+                (cache_dir / entry["file"]).unlink()
+            except (FileNotFoundError, KeyError):
+                pass
+
+    changed = written > 0 or list(old.items()) != list(new.items())
+    if changed:
+        # Manifest goes last and atomically: a crash mid-write leaves the old one valid.
+        tmp = cache_dir / (MANIFEST_NAME + ".tmp")
+        tmp.write_bytes(_encode(new))
+        os.replace(tmp, cache_dir / MANIFEST_NAME)
+    logger.info("Schema cache: %d/%d tables rewritten.", written, len(new))
+    return changed
+
+
+def load_schema_cache(cache_dir: Path = SCHEMA_CACHE_DIR) -> dict | None:
+    """Reassemble the cached schema, falling back to the legacy single-file cache."""
+    manifest = _read_manifest(cache_dir)
+    if not manifest:
+        if SCHEMA_CACHE_FILE.exists():
+            try:
+                return json.loads(SCHEMA_CACHE_FILE.read_bytes())
+            except ValueError:
+                return None
+        return None
+    try:
+        return {
+            name: json.loads((cache_dir / entry["file"]).read_bytes())
+            for name, entry in manifest.items()
+        }
+    except (OSError, ValueError, KeyError) as exc:
+        logger.warning("Schema cache unreadable: %s", exc)
+        return None
@@ -2,15 +2,20 @@
 Neuro-Fabric FastAPI Server — DuckDB-first architecture.
 """
 from __future__ import annotations
-import json, logging, traceback, uuid
+import functools, json, logging, mimetypes, os, re, threading, traceback, uuid
+import anyio
 from pathlib import Path
 from typing import Any
+import msgspec
+import orjson
+from cachetools import TTLCache, cached
 from dotenv import load_dotenv
 load_dotenv()
 
-from fastapi import FastAPI, HTTPException
+from fastapi import Depends, FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import FileResponse, JSONResponse, Response, StreamingResponse
 from pydantic import BaseModel
 from core.config import LOG_LEVEL, OUTPUTS_DIR, validate_config, GEMINI_MODEL
 from core.state import extract_message_content
@@ -24,6 +29,8 @@ app = FastAPI(title="Neuro-Fabric API",
               version="2.0.0")
 app.add_middleware(CORSMiddleware, allow_origins=["*"], allow_credentials=True,
                    allow_methods=["*"], allow_headers=["*"])
+# Schema/state/quality dumps are large JSON; pre-encoded static bodies pass through untouched
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
 
 # ── State ────────────────────────────────────────────────────────────────────
 pipeline_state: dict[str, Any] = {
@@ -32,6 +39,13 @@ pipeline_state: dict[str, Any] = {
 }
 chat_thread_id = str(uuid.uuid4())
 
+# Serialized /api/state body, rebuilt only when pipeline_state changes
+_state_cache: dict[str, Any] = {"version": 0, "built": -1, "body": b"", "etag": ""}
+
+def _touch_state() -> None:
+    """Mark pipeline_state as modified; call after every mutation."""
+    _state_cache["version"] += 1
+
 # Database configurations for hackathon datasets
 DATABASE_CONFIGS = {
     "olist": {
@@ -92,9 +106,9 @@ async def startup_event():
         try:
             logger.info("Startup: Attempting auto-reconnect to database...")
             if DATABASE_URL:
-                from sqlalchemy import create_engine
+                from core.db_connectors import get_engine
                 global _current_engine, _current_engine_type
-                _current_engine = create_engine(DATABASE_URL, pool_pre_ping=True)
+                _current_engine = get_engine({"url": DATABASE_URL})
                 _current_engine_type = "postgres"
                 logger.info("Startup: Connected to Postgres via DATABASE_URL")
             else:
@@ -113,19 +127,34 @@ class ConnectRequest(BaseModel):
     github_token: str = ""
     github_repo: str = ""
 
-class ChatRequest(BaseModel):
+# Hot-path bodies are msgspec Structs, decoded and validated in one C pass
+class ChatRequest(msgspec.Struct):
     message: str
     db: str = "olist"
-    history: list = []
+    history: list = msgspec.field(default_factory=list)
 
-class PipelineRequest(BaseModel):
+class PipelineRequest(msgspec.Struct):
     url: str = ""
     name: str = "database"
 
-class SQLRequest(BaseModel):
+class SQLRequest(msgspec.Struct):
     query: str
     limit: int = 100
 
+def _struct_body(model):
+    """FastAPI dependency that decodes the JSON request body into a msgspec Struct."""
+    decoder = msgspec.json.Decoder(model, strict=False)
+    async def decode(request: Request):
+        try:
+            return decoder.decode(await request.body())
+        except msgspec.DecodeError as e:
+            raise HTTPException(422, str(e))
+    return decode
+
+_chat_body = _struct_body(ChatRequest)
+_pipeline_body = _struct_body(PipelineRequest)
+_sql_body = _struct_body(SQLRequest)
+
 @app.get("/api/health")
 async def health_check():
     return {
@@ -149,16 +178,16 @@ async def select_database(db_name: str):
         pipeline_state["schema"] = {}
         pipeline_state["quality_report"] = {}
         pipeline_state["documentation"] = {}
+        _touch_state()
+        _quality_cache.clear()
         return {"success": True, "database": db_name, "engine": _current_engine_type}
     return {"success": False, "error": "Database not found"}
 
 # ── Tables ───────────────────────────────────────────────────────────────────
-@app.get("/api/tables")
-async def list_tables_endpoint(db: str = ""):
+def _list_tables_endpoint(db: str = ""):
     """Get list of tables dynamically from the connected database."""
     try:
-        from core.db_connectors import get_inspector, list_schemas, DuckDBEngine
-        from sqlalchemy import inspect as sa_inspect, text
+        from core.db_connectors import get_inspector, get_row_counts, list_schemas
         
         if not _current_engine:
             return {"tables": [], "total": 0, "error": "Connect to database first"}
@@ -166,6 +195,8 @@ async def list_tables_endpoint(db: str = ""):
         engine = _current_engine
         inspector = get_inspector(engine)
         tables = []
+        # One catalog query for every table's row count
+        row_counts = get_row_counts(engine)
         
         # Dynamically discover all schemas and tables
         schemas = list_schemas(engine)
@@ -177,14 +208,9 @@ async def list_tables_endpoint(db: str = ""):
                         # Get column count
                         cols = inspector.get_columns(table_name, schema=schema_name)
                         
-                        # Get row count
-                        with engine.connect() as conn:
-                            if isinstance(engine, DuckDBEngine):
-                                q = f'"{schema_name}"."{table_name}"' if schema_name != "main" else f'"{table_name}"'
-                                rc = conn.execute(f"SELECT COUNT(*) FROM {q}").fetchone()[0]
-                            else:
-                                q = f'"{schema_name}"."{table_name}"'
-                                rc = conn.execute(text(f"SELECT COUNT(*) FROM {q}")).fetchone()[0]
+                        rc = row_counts.get((schema_name, table_name))
+                        if rc is None:
+                            rc = _count_rows(engine, schema_name, table_name)
                         
                         tables.append({
                             "table_name": table_name,
@@ -208,9 +234,12 @@ async def list_tables_endpoint(db: str = ""):
         logger.error("Tables endpoint failed: %s", e)
         return {"tables": [], "total": 0, "error": str(e)}
 
+@app.get("/api/tables")
+async def list_tables_endpoint(db: str = ""):
+    return await _in_thread(_list_tables_endpoint, db)
+
 # ── Columns ──────────────────────────────────────────────────────────────────
-@app.get("/api/columns")
-async def get_columns_endpoint(table: str = "", schema: str = ""):
+def _get_columns_endpoint(table: str = "", schema: str = ""):
     """Get columns for a specific table dynamically."""
     if not table:
         return {"error": "Table name is required", "columns": []}
@@ -254,13 +283,15 @@ async def get_columns_endpoint(table: str = "", schema: str = ""):
         logger.error("Columns endpoint failed: %s", e)
         return {"error": str(e), "columns": []}
 
+@app.get("/api/columns")
+async def get_columns_endpoint(table: str = "", schema: str = ""):
+    return await _in_thread(_get_columns_endpoint, table, schema)
+
 # ── Quality Metrics ─────────────────────────────────────────────────────────
-@app.get("/api/quality")
-async def get_quality_endpoint(table: str = "", schema: str = ""):
+def _get_quality_endpoint(table: str = "", schema: str = ""):
     """Get quality metrics dynamically for all tables or a specific table."""
     try:
         from core.db_connectors import get_inspector, list_schemas, DuckDBEngine
-        from sqlalchemy import text
         
         if not _current_engine:
             return {"error": "Connect to database first"}
@@ -288,56 +319,30 @@ async def get_quality_endpoint(table: str = "", schema: str = ""):
         
         for schema_name, table_name in tables_to_analyze:
             try:
-                with engine.connect() as conn:
-                    # Get row count
-                    if isinstance(engine, DuckDBEngine):
-                        q = f'"{schema_name}"."{table_name}"' if schema_name != "main" else f'"{table_name}"'
-                        total_result = conn.execute(f"SELECT COUNT(*) FROM {q}")
-                    else:
-                        q = f'"{schema_name}"."{table_name}"'
-                        total_result = conn.execute(text(f"SELECT COUNT(*) FROM {q}"))
-                    
-                    total = total_result.fetchone()[0]
-                    if total == 0:
-                        continue
-                    
-                    # Get columns
-                    cols = inspector.get_columns(table_name, schema=schema_name)
-                    
-                    column_quality = []
-                    for col in cols:
-                        col_name = col["name"]
-                        try:
-                            if isinstance(engine, DuckDBEngine):
-                                null_result = conn.execute(f'SELECT COUNT(*) FROM {q} WHERE "{col_name}" IS NULL').fetchone()
-                                distinct_result = conn.execute(f'SELECT COUNT(DISTINCT "{col_name}") FROM {q}').fetchone()
-                            else:
-                                null_result = conn.execute(text(f'SELECT COUNT(*) FROM {q} WHERE "{col_name}" IS NULL')).fetchone()
-                                distinct_result = conn.execute(text(f'SELECT COUNT(DISTINCT "{col_name}") FROM {q}')).fetchone()
-                            
-                            null_count = null_result[0] if null_result else 0
-                            distinct_count = distinct_result[0] if distinct_result else 0
-                            
-                            column_quality.append({
-                                "column_name": col_name,
-                                "null_rate": round(null_count / total, 4) if total > 0 else 0,
-                                "distinct_count": distinct_count
-                            })
-                        except Exception as col_e:
-                            logger.warning(f"Quality check failed for column {col_name}: {col_e}")
-                            column_quality.append({
-                                "column_name": col_name,
-                                "null_rate": 0,
-                                "distinct_count": 0
-                            })
-                    
-                    results.append({
-                        "table_name": table_name,
-                        "schema_name": schema_name,
-                        "row_count": total,
-                        "overall_completeness": round(1 - (sum(c["null_rate"] for c in column_quality) / len(column_quality)), 4) if column_quality else 1,
-                        "column_quality": column_quality
+                q = _qualify(schema_name, table_name)
+                cols = inspector.get_columns(table_name, schema=schema_name)
+                col_names = [c["name"] for c in cols]
+                # Row count plus null/distinct counts for every column in one scan
+                total, col_stats = _table_column_stats(engine, q, col_names)
+                if total == 0:
+                    continue
+                
+                column_quality = []
+                for col_name in col_names:
+                    null_count, distinct_count = col_stats.get(col_name, (0, 0))
+                    column_quality.append({
+                        "column_name": col_name,
+                        "null_rate": round(null_count / total, 4) if total > 0 else 0,
+                        "distinct_count": distinct_count
                     })
+                
+                results.append({
+                    "table_name": table_name,
+                    "schema_name": schema_name,
+                    "row_count": total,
+                    "overall_completeness": round(1 - (sum(c["null_rate"] for c in column_quality) / len(column_quality)), 4) if column_quality else 1,
+                    "column_quality": column_quality
+                })
             except Exception as e:
                 logger.warning(f"Quality check failed for {schema_name}.{table_name}: {e}")
                 continue
@@ -347,6 +352,19 @@ async def get_quality_endpoint(table: str = "", schema: str = ""):
         logger.error("Quality endpoint failed: %s", e)
         return {"quality": [], "total": 0, "error": str(e)}
 
+# (table, schema) -> (body, etag); cleared on connect, database switch and pipeline completion
+_quality_cache: TTLCache = TTLCache(maxsize=64, ttl=300)
+
+@app.get("/api/quality")
+async def get_quality_endpoint(request: Request, table: str = "", schema: str = ""):
+    entry = _quality_cache.get((table, schema))
+    if entry is None:
+        data = await _in_thread(_get_quality_endpoint, table, schema)
+        if "error" in data:
+            return data
+        entry = _quality_cache[(table, schema)] = _json_etag(data)
+    return _etag_response(request, *entry, cache_control="no-cache")
+
 # ── Documentation ───────────────────────────────────────────────────────────
 @app.get("/api/docs")
 async def get_docs(db: str = "olist", table: str = ""):
@@ -396,10 +414,10 @@ async def generate_docs(table: str = "", schema: str = ""):
                     cols = inspector.get_columns(table_name, schema=schema_name)
                     
                     if isinstance(engine, DuckDBEngine):
-                        q = f'"{schema_name}"."{table_name}"' if schema_name != "main" else f'"{table_name}"'
+                        q = _qualify(schema_name, table_name)
                         total = conn.execute(f"SELECT COUNT(*) FROM {q}").fetchone()[0]
                     else:
-                        q = f'"{schema_name}"."{table_name}"'
+                        q = _qualify(schema_name, table_name)
                         total = conn.execute(text(f"SELECT COUNT(*) FROM {q}")).fetchone()[0]
                 
                 # Build column info
@@ -477,6 +495,7 @@ Format as JSON with keys: business_summary, column_descriptions (object), usage_
                 }
         
         pipeline_state["documentation"] = docs
+        _touch_state()
         
         # Auto-save docs to outputs/ directory for Artifacts panel
         try:
@@ -484,8 +503,7 @@ Format as JSON with keys: business_summary, column_descriptions (object), usage_
             from datetime import datetime
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             artifact_path = OUTPUTS_DIR / f"ai_documentation_{timestamp}.json"
-            with open(artifact_path, "w") as f:
-                json.dump(docs, f, indent=2, default=str)
+            artifact_path.write_bytes(orjson.dumps(docs, default=str, option=orjson.OPT_INDENT_2))
             logger.info(f"Saved documentation artifact to {artifact_path}")
         except Exception as save_err:
             logger.warning(f"Failed to save docs artifact: {save_err}")
@@ -500,8 +518,7 @@ async def settings_connect(req: ConnectRequest):
     """Dynamic connection endpoint for SaaS model."""
     global _current_engine, _current_engine_type
     try:
-        from sqlalchemy import create_engine
-        from core.db_connectors import test_connection, get_db_type, DuckDBEngine
+        from core.db_connectors import clear_reflection_cache, get_engine, test_connection, get_db_type, DuckDBEngine
         import os
         
         ok = False
@@ -519,13 +536,16 @@ async def settings_connect(req: ConnectRequest):
         import core.neo4j_connector as neo4j_conn
         neo4j_conn._driver = None  # Reset driver singleton
 
+        clear_reflection_cache()
+        _CHAT_CACHE.clear()
+        _quality_cache.clear()
         if req.db_url:
             if req.db_url.startswith("duckdb"):
                 from core.db_connectors import DuckDBEngine
                 path = req.db_url.split("///")[-1] if "///" in req.db_url else req.db_url
                 _current_engine = DuckDBEngine(path)
             else:
-                _current_engine = create_engine(req.db_url, pool_pre_ping=True)
+                _current_engine = get_engine({"url": req.db_url})
             
             ok = test_connection(_current_engine)
             db_type = "duckdb" if isinstance(_current_engine, DuckDBEngine) else get_db_type(_current_engine)
@@ -536,6 +556,7 @@ async def settings_connect(req: ConnectRequest):
             pipeline_state["schema"] = {}
             pipeline_state["quality_report"] = {}
             pipeline_state["documentation"] = {}
+            _touch_state()
         else:
             # If no DB URL is provided, disconnect
             _current_engine = None
@@ -549,13 +570,11 @@ async def settings_connect(req: ConnectRequest):
         return {"connected": False, "engine": "error", "message": str(e)}
 
 # ── Schema ───────────────────────────────────────────────────────────────────
-@app.get("/api/schema")
-async def get_schema():
+def _get_schema():
     if pipeline_state["schema"]:
         return pipeline_state["schema"]
     try:
-        from core.db_connectors import get_inspector, list_schemas, DuckDBEngine
-        from sqlalchemy import text
+        from core.db_connectors import get_inspector, get_row_counts, list_schemas
         
         if not _current_engine:
             return {"success": False, "error": "Connect to database first"}
@@ -563,6 +582,7 @@ async def get_schema():
         engine = _current_engine
         inspector = get_inspector(engine)
         schemas = list_schemas(engine)
+        row_counts = get_row_counts(engine)
         data = {}
         
         for sn in schemas:
@@ -572,37 +592,38 @@ async def get_schema():
                 logger.warning(f"Could not get tables for schema {sn}: {e}")
                 continue
                 
+            # One reflection pass per kind for the whole schema; None means
+            # the batch call failed and tables are reflected one by one.
+            all_cols = _reflect_multi(inspector, "columns", sn)
+            all_pks = _reflect_multi(inspector, "pk_constraint", sn)
+            all_fks = _reflect_multi(inspector, "foreign_keys", sn)
+                
             for tn in table_names:
                 full = f"{sn}.{tn}" if sn != "main" and sn != "public" else tn
                 
                 try:
-                    cols = inspector.get_columns(tn, schema=sn)
+                    cols = all_cols[(sn, tn)] if all_cols is not None else inspector.get_columns(tn, schema=sn)
                 except Exception:
                     cols = []
                     
                 try:
-                    pk = inspector.get_pk_constraint(tn, schema=sn)
+                    pk = all_pks[(sn, tn)] if all_pks is not None else inspector.get_pk_constraint(tn, schema=sn)
                     pk_cols = pk.get("constrained_columns", []) if pk else []
                 except Exception:
                     pk_cols = []
                     
                 try:
-                    fks = inspector.get_foreign_keys(tn, schema=sn)
+                    fks = all_fks[(sn, tn)] if all_fks is not None else inspector.get_foreign_keys(tn, schema=sn)
                 except Exception:
                     fks = []
                     
-                rc = 0
-                try:
-                    with engine.connect() as conn:
-                        if isinstance(engine, DuckDBEngine):
-                            q = f'"{sn}"."{tn}"' if sn != "main" else f'"{tn}"'
-                            rc = conn.execute(f"SELECT COUNT(*) FROM {q}").fetchone()[0]
-                        else:
-                            # Postgres/Supabase quoting
-                            q = f'"{sn}"."{tn}"'
-                            rc = conn.execute(text(f"SELECT COUNT(*) FROM {q}")).fetchone()[0]
-                except Exception as e:
-                    logger.warning(f"Row count failed for {full}: {e}")
+                rc = row_counts.get((sn, tn))
+                if rc is None:
+                    try:
+                        rc = _count_rows(engine, sn, tn)
+                    except Exception as e:
+                        rc = 0
+                        logger.warning(f"Row count failed for {full}: {e}")
                     
                 formatted_cols = []
                 for c in cols:
@@ -633,68 +654,150 @@ async def get_schema():
                 }
                 
         pipeline_state["schema"] = data
+        _touch_state()
         return data
     except Exception as e:
         logger.error("Schema failed: %s", e)
         return {"success": False, "error": str(e)}
 
+# Serialized /api/schema body, valid while the state version is unchanged
+_schema_cache = {"version": -1, "body": b"", "etag": ""}
+
+@app.get("/api/schema")
+async def get_schema(request: Request):
+    if not pipeline_state["schema"] or _schema_cache["version"] != _state_cache["version"]:
+        data = await _in_thread(_get_schema)
+        if not pipeline_state["schema"]:
+            return data
+        body, etag = _json_etag(data)
+        _schema_cache.update(version=_state_cache["version"], body=body, etag=etag)
+    return _etag_response(request, _schema_cache["body"], _schema_cache["etag"], cache_control="no-cache")
+
 # ── SQL Query ────────────────────────────────────────────────────────────────
-@app.post("/api/query")
-async def execute_query(req: SQLRequest):
+# Whole-word match, so columns like updated_at don't trip the filter
+_DANGEROUS_SQL = re.compile(r"\b(?:DROP|TRUNCATE|ALTER|DELETE|INSERT|UPDATE|GRANT|REVOKE)\b", re.I)
+
+def _execute_query(req: SQLRequest):
     try:
-        from core.db_connectors import get_db_type
+        from core.db_connectors import get_db_type, get_duckdb_conn
         
         if not _current_engine:
             return {"error": "Connect to database first"}
             
         engine = _current_engine
-        sql_up = req.query.strip().upper()
-        if any(k in sql_up for k in ["DROP ", "TRUNCATE ", "ALTER ", "DELETE ", "INSERT ", "UPDATE "]):
+        if _DANGEROUS_SQL.search(req.query):
             return {"error": "Write operations disabled.", "rows": [], "columns": []}
-        from sqlalchemy import text as sa_text
-        with engine.connect() as conn:
-            result = conn.execute(sa_text(req.query))
-            columns = result.keys() if hasattr(result, 'keys') else []
-            rows = result.fetchmany(req.limit)
-            data = [{c: _ser_val(v) for c, v in zip(columns, r)} for r in rows]
+        if get_db_type(engine) == "duckdb":
+            columns, rows = _duckdb_fetch(get_duckdb_conn(engine), req.query, req.limit)
+        else:
+            from sqlalchemy import text as sa_text
+            with engine.connect() as conn:
+                result = conn.execute(sa_text(req.query))
+                columns = result.keys() if hasattr(result, 'keys') else []
+                rows = result.fetchmany(req.limit)
+        data = [{c: _ser_val(v) for c, v in zip(columns, r)} for r in rows]
         return {"columns": list(columns), "rows": data, "row_count": len(data),
                 "engine": get_db_type(engine), "truncated": len(data) >= req.limit}
     except Exception as e:
         logger.error("Query failed: %s", e)
         return {"error": str(e), "rows": [], "columns": []}
 
-@app.get("/api/sample/{table}")
-async def get_sample_rows(table: str, limit: int = 10):
+@app.post("/api/query")
+async def execute_query(req: SQLRequest = Depends(_sql_body)):
+    return await _in_thread(_execute_query, req)
+
+# Rows fetched per round-trip while streaming
+_STREAM_BATCH = 1000
+
+def _open_query_stream(req: SQLRequest):
+    """Execute req.query on a connection owned by the stream and return an NDJSON line iterator."""
+    from core.db_connectors import get_db_type, get_duckdb_conn
+    engine = _current_engine
+    if get_db_type(engine) == "duckdb":
+        # Starlette may advance the generator from different pool threads,
+        # so it can't borrow the thread-local cursor.
+        cur = get_duckdb_conn(engine, fresh=True)
+        try:
+            cur.execute(req.query)
+        except Exception:
+            cur.close()
+            raise
+        columns = [d[0] for d in cur.description] if cur.description else []
+        fetch, close = cur.fetchmany, cur.close
+    else:
+        from sqlalchemy import text as sa_text
+        conn = engine.connect().execution_options(stream_results=True)
+        try:
+            result = conn.execute(sa_text(req.query))
+        except Exception:
+            conn.close()
+            raise
+        columns = list(result.keys())
+        fetch, close = result.fetchmany, conn.close
+
+    def lines():
+        try:
+            yield orjson.dumps({"columns": columns}) + b"\n"
+            remaining = req.limit
+            while columns and remaining > 0:
+                batch = fetch(min(_STREAM_BATCH, remaining))
+                if not batch:
+                    break
+                remaining -= len(batch)
+                yield b"".join(orjson.dumps(tuple(r), default=_ser_val, option=_ORJSON_OPTS) + b"\n" for r in batch)
+        finally:
+            close()
+    return lines()
+
+@app.post("/api/query/stream")
+async def stream_query(req: SQLRequest = Depends(_sql_body)):
+    """Stream results as NDJSON: a {"columns": [...]} line, then one JSON array per row."""
+    if not _current_engine:
+        return {"error": "Connect to database first"}
+    if _DANGEROUS_SQL.search(req.query):
+        return {"error": "Write operations disabled.", "rows": [], "columns": []}
     try:
-        from core.db_connectors import DuckDBEngine
+        lines = await _in_thread(_open_query_stream, req)
+    except Exception as e:
+        logger.error("Query stream failed: %s", e)
+        return {"error": str(e), "rows": [], "columns": []}
+    return StreamingResponse(lines, media_type="application/x-ndjson")
+
+def _get_sample_rows(table: str, limit: int = 10):
+    try:
+        from core.db_connectors import DuckDBEngine, get_duckdb_conn
         from sqlalchemy import text
         
         if not _current_engine:
             return {"success": False, "error": "Connect to database first"}
             
         engine = _current_engine
-        if "." in table:
-            s, t = table.split(".", 1)
-            # Ensure safe quoting
-            q = f'"{s}"."{t}"'
-        else:
-            q = f'"{table}"'
+        resolved = _known_table(engine, table)
+        if resolved is None:
+            raise HTTPException(404, f"Unknown table: {table}")
+        q = _qualify(*resolved)
+        limit = max(0, limit)
             
-        with engine.connect() as conn:
-            if isinstance(engine, DuckDBEngine):
-                result = conn.execute(f"SELECT * FROM {q} LIMIT {limit}")
-            else:
+        if isinstance(engine, DuckDBEngine):
+            cols, rows = _duckdb_fetch(get_duckdb_conn(engine), f"SELECT * FROM {q} LIMIT {limit}")
+        else:
+            with engine.connect() as conn:
                 result = conn.execute(text(f"SELECT * FROM {q} LIMIT {limit}"))
-                
-            cols = result.keys()
-            rows = result.fetchall()
+                cols = result.keys()
+                rows = result.fetchall()
             
         data = [{c: _ser_val(v) for c, v in zip(cols, r)} for r in rows]
         return {"columns": list(cols), "rows": data, "table": table}
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error("Sample failed: %s", e)
         raise HTTPException(500, str(e))
 
+@app.get("/api/sample/{table}")
+async def get_sample_rows(table: str, limit: int = 10):
+    return await _in_thread(_get_sample_rows, table, limit)
+
 # ── Docs / Pipeline / State ──────────────────────────────────────────────────
 @app.get("/api/docs")
 async def get_docs():
@@ -841,10 +944,10 @@ def _generate_local_docs(req: DocsGenerateRequest) -> dict:
         'generated_at': __import__('datetime').datetime.now().isoformat()
     }
 
-@app.post("/api/pipeline")
-async def run_pipeline(req: PipelineRequest):
+def _run_pipeline(req: PipelineRequest):
     global pipeline_state
     pipeline_state["status"] = "running"; pipeline_state["progress"] = 0
+    _touch_state()
     try:
         from agents.supervisor import get_pipeline_app
         graph = get_pipeline_app()
@@ -858,27 +961,40 @@ async def run_pipeline(req: PipelineRequest):
             elif event.get("documentation"): pipeline_state["progress"] = 75
             elif event.get("quality_report"): pipeline_state["progress"] = 50
             elif event.get("schema"): pipeline_state["progress"] = 25
+            _touch_state()
         if final:
             for k in ["schema","quality_report","documentation","artifacts","errors"]:
                 pipeline_state[k] = _ser(final.get(k, {} if k != "artifacts" and k != "errors" else []))
             pipeline_state["status"] = "complete"; pipeline_state["progress"] = 100
+            _touch_state()
+            _CHAT_CACHE.clear()
+            _quality_cache.clear()
         return {"status": "complete", "tables": len(pipeline_state["schema"])}
     except Exception as e:
         logger.error("Pipeline failed: %s", e); pipeline_state["status"] = "error"
+        _touch_state()
         raise HTTPException(500, str(e))
 
+@app.post("/api/pipeline")
+async def run_pipeline(req: PipelineRequest = Depends(_pipeline_body)):
+    # Long-running; uses the default thread pool rather than the DB limiter
+    return await anyio.to_thread.run_sync(_run_pipeline, req)
+
 @app.get("/api/state")
-async def get_state():
-    return {k: pipeline_state[k] for k in pipeline_state}
+async def get_state(request: Request):
+    if _state_cache["built"] != _state_cache["version"]:
+        body, etag = _json_etag(pipeline_state)
+        _state_cache.update(built=_state_cache["version"], body=body, etag=etag)
+    return _etag_response(request, _state_cache["body"], _state_cache["etag"])
 
 # ── Chat ─────────────────────────────────────────────────────────────────────
 @app.post("/api/chat")
-async def chat(req: ChatRequest):
+async def chat(req: ChatRequest = Depends(_chat_body)):
     global chat_thread_id
     from core.config import GOOGLE_API_KEY
     
     if not GOOGLE_API_KEY:
-        return _smart_chat(req.message)
+        return await _in_thread(_smart_chat, req.message)
     try:
         from langchain_core.messages import HumanMessage, SystemMessage
         from agents.supervisor import get_chat_app
@@ -908,7 +1024,8 @@ async def chat(req: ChatRequest):
                "quality_report": pipeline_state.get("quality_report", {}),
                "documentation": pipeline_state.get("documentation", {}),
                "artifacts": [], "current_task": "chat", "errors": []}
-        result = chat_app.invoke(inp, config={"configurable": {"thread_id": chat_thread_id}})
+        result = await anyio.to_thread.run_sync(
+            functools.partial(chat_app.invoke, inp, config={"configurable": {"thread_id": chat_thread_id}}))
         msgs = result.get("messages", [])
         if not msgs:
             return {"response": "No response."}
@@ -917,7 +1034,7 @@ async def chat(req: ChatRequest):
         return {"response": content}
     except Exception as e:
         logger.error("Chat LLM failed: %s", e)
-        return _smart_chat(req.message)
+        return await _in_thread(_smart_chat, req.message)
 
 
 # ── WebSocket Chat (Real-Time Streaming) ─────────────────────────────────────
@@ -945,7 +1062,7 @@ async def ws_chat(ws: WebSocket):
             if not GOOGLE_API_KEY:
                 # Fallback to smart chat (no streaming needed)
                 await ws.send_json({"type": "phase", "phase": 1, "label": "Analyzing your query..."})
-                result = _smart_chat(msg)
+                result = await _in_thread(_smart_chat, msg)
                 await ws.send_json({"type": "phase", "phase": 3, "label": "Generating response..."})
                 await ws.send_json({"type": "response", "content": result.get("response", "No response.")})
                 continue
@@ -1005,7 +1122,7 @@ async def ws_chat(ws: WebSocket):
             except Exception as e:
                 logger.error("WS Chat LLM failed: %s", e)
                 # Fallback to smart chat
-                result = _smart_chat(msg)
+                result = await _in_thread(_smart_chat, msg)
                 await ws.send_json({"type": "response", "content": result.get("response", str(e))})
                 
     except WebSocketDisconnect:
@@ -1017,11 +1134,33 @@ async def ws_chat(ws: WebSocket):
         except Exception:
             pass
 
+# Fallback chat intents, in priority order. The lookahead lets finditer report
+# every keyword occurrence (same semantics as a plain substring test).
+_CHAT_INTENTS = re.compile(
+    r"(?=(?P<count>how many|count|total)"
+    r"|(?P<tables>schema|table|list)"
+    r"|(?P<revenue>revenue|sales|money|price|amount)"
+    r"|(?P<sample>top|best|popular|sample))"
+)
+_REVENUE_TABLE = re.compile(r"order|item|payment|sale|transaction|revenue")
+_PRICE_COLUMN = re.compile(r"price|value|amount")
+_CHAT_HELP = ("**Neuro-Fabric Chat**\n\nI can help you explore your database. Try asking:\n\n"
+              "• *How many rows in [table]?*\n• *List all tables*\n• *Show revenue stats*\n• *Sample from [table]*\n\n"
+              "Add `GOOGLE_API_KEY` to `.env` for AI-powered responses!")
+
+# Fallback-chat query results, keyed by SQL; cleared on connect and pipeline completion
+_CHAT_CACHE: TTLCache = TTLCache(maxsize=128, ttl=30)
+
+@cached(_CHAT_CACHE, lock=threading.RLock())
+def _chat_rows(sql: str) -> list:
+    from sqlalchemy import text
+    with _current_engine.connect() as c:
+        return list(c.execute(text(sql)).fetchall())
+
 def _smart_chat(msg: str, db_name: str = "") -> dict:
     """Smart chat responses using dynamically discovered database schema."""
     try:
-        from core.db_connectors import get_inspector, list_schemas, DuckDBEngine
-        from sqlalchemy import text
+        from core.db_connectors import get_inspector, list_schemas
         
         if not _current_engine:
             return {"response": "No database connected. Please connect a database in Settings first."}
@@ -1029,6 +1168,9 @@ def _smart_chat(msg: str, db_name: str = "") -> dict:
         engine = _current_engine
         inspector = get_inspector(engine)
         ml = msg.lower()
+        intents = {m.lastgroup for m in _CHAT_INTENTS.finditer(ml)}
+        if not intents:
+            return {"response": _CHAT_HELP}
         
         # Dynamically get all tables
         all_tables = []
@@ -1040,23 +1182,17 @@ def _smart_chat(msg: str, db_name: str = "") -> dict:
             except Exception as e:
                 logger.warning(f"Failed to list tables for schema {sn}: {e}")
         
-        if any(k in ml for k in ["how many", "count", "total"]):
+        if "count" in intents:
             # Check if user is asking about a specific table
             for schema_name, table_name in all_tables:
                 if table_name.lower() in ml:
-                    with engine.connect() as c:
-                        if isinstance(engine, DuckDBEngine):
-                            q = f'"{schema_name}"."{table_name}"' if schema_name != "main" else f'"{table_name}"'
-                            n = c.execute(f"SELECT COUNT(*) FROM {q}").fetchone()[0]
-                        else:
-                            q = f'"{schema_name}"."{table_name}"'
-                            n = c.execute(text(f"SELECT COUNT(*) FROM {q}")).fetchone()[0]
+                    n = _chat_rows(f"SELECT COUNT(*) FROM {_qualify(schema_name, table_name)}")[0][0]
                     return {"response": f"There are **{n:,}** rows in the `{table_name}` table."}
             # List available tables
             table_list = [tn for _, tn in all_tables[:10]]
             return {"response": f"Available tables: {', '.join(table_list)}{'...' if len(all_tables) > 10 else ''}\n\nTry: *How many [table_name]?*"}
         
-        if any(k in ml for k in ["schema","table","list", "tables"]):
+        if "tables" in intents:
             table_list = [f"`{sn}.{tn}`" if sn != "main" else f"`{tn}`" for sn, tn in all_tables[:20]]
             lines = [f"📁 **Database Tables ({len(all_tables)} total):**\n"]
             lines.extend([f"  • {t}" for t in table_list])
@@ -1064,69 +1200,41 @@ def _smart_chat(msg: str, db_name: str = "") -> dict:
                 lines.append(f"  ... and {len(all_tables) - 20} more tables")
             return {"response": "\n".join(lines)}
         
-        if any(k in ml for k in ["revenue","sales","money", "price", "amount"]):
+        if "revenue" in intents:
             # Try common revenue tables by name matching
-            revenue_keywords = ["order", "item", "payment", "sale", "transaction", "revenue"]
             for schema_name, table_name in all_tables:
-                if any(kw in table_name.lower() for kw in revenue_keywords):
-                    with engine.connect() as c:
-                        try:
-                            if isinstance(engine, DuckDBEngine):
-                                q = f'"{schema_name}"."{table_name}"' if schema_name != "main" else f'"{table_name}"'
-                                # Try to find price/value columns
-                                cols = inspector.get_columns(table_name, schema=schema_name)
-                                price_col = None
-                                for col in cols:
-                                    col_name = col['name'].lower()
-                                    if 'price' in col_name or 'value' in col_name or 'amount' in col_name:
-                                        price_col = col['name']
-                                        break
-                                
-                                if price_col:
-                                    r = c.execute(f"SELECT COUNT(*), COALESCE(SUM(\"{price_col}\"),0), COALESCE(AVG(\"{price_col}\"),0) FROM {q}").fetchone()
-                                    return {"response": f"💰 **{table_name}**\n- {r[0]:,} records\n- Total: {r[1]:,.2f}\n- Average: {r[2]:,.2f}"}
-                            else:
-                                q = f'"{schema_name}"."{table_name}"'
-                                cols = inspector.get_columns(table_name, schema=schema_name)
-                                price_col = None
-                                for col in cols:
-                                    col_name = col['name'].lower()
-                                    if 'price' in col_name or 'value' in col_name or 'amount' in col_name:
-                                        price_col = col['name']
-                                        break
-                                
-                                if price_col:
-                                    r = c.execute(text(f"SELECT COUNT(*), COALESCE(SUM(\"{price_col}\"),0), COALESCE(AVG(\"{price_col}\"),0) FROM {q}")).fetchone()
-                                    return {"response": f"💰 **{table_name}**\n- {r[0]:,} records\n- Total: {r[1]:,.2f}\n- Average: {r[2]:,.2f}"}
-                        except Exception as e:
-                            logger.debug(f"Revenue check failed for {table_name}: {e}")
-                            pass
-            return {"response": "Could not find revenue data in this database. Try asking about specific tables."}
-        
-        if any(k in ml for k in ["top","best","popular", "sample"]):
-            # Return sample from first few tables
-            for schema_name, table_name in all_tables[:3]:
-                with engine.connect() as c:
+                if _REVENUE_TABLE.search(table_name.lower()):
                     try:
-                        if isinstance(engine, DuckDBEngine):
-                            q = f'"{schema_name}"."{table_name}"' if schema_name != "main" else f'"{table_name}"'
-                            cols_result = c.execute(f"SELECT * FROM {q} LIMIT 3")
-                            cols = [desc[0] for desc in cols_result.description] if hasattr(cols_result, 'description') else []
-                            rows = cols_result.fetchall()
-                        else:
-                            q = f'"{schema_name}"."{table_name}"'
-                            result = c.execute(text(f"SELECT * FROM {q} LIMIT 3"))
-                            cols = list(result.keys()) if hasattr(result, 'keys') else []
-                            rows = result.fetchall()
+                        q = _qualify(schema_name, table_name)
+                        # Try to find price/value columns
+                        cols = inspector.get_columns(table_name, schema=schema_name)
+                        price_col = None
+                        for col in cols:
+                            if _PRICE_COLUMN.search(col['name'].lower()):
+                                price_col = _quote_ident(col['name'])
+                                break
                         
-                        row_str = "\n".join([str(row) for row in rows[:3]])
-                        return {"response": f"🏆 **Sample from {table_name}:**\n```\n{row_str}\n```"}
+                        if price_col:
+                            r = _chat_rows(f"SELECT COUNT(*), COALESCE(SUM({price_col}),0), COALESCE(AVG({price_col}),0) FROM {q}")[0]
+                            return {"response": f"💰 **{table_name}**\n- {r[0]:,} records\n- Total: {r[1]:,.2f}\n- Average: {r[2]:,.2f}"}
                     except Exception as e:
-                        logger.debug(f"Sample failed for {table_name}: {e}")
+                        logger.debug(f"Revenue check failed for {table_name}: {e}")
                         pass
+            return {"response": "Could not find revenue data in this database. Try asking about specific tables."}
+        
+        if "sample" in intents:
+            # Return sample from first few tables
+            for schema_name, table_name in all_tables[:3]:
+                try:
+                    rows = _chat_rows(f"SELECT * FROM {_qualify(schema_name, table_name)} LIMIT 3")
+                    row_str = "\n".join([str(row) for row in rows[:3]])
+                    return {"response": f"🏆 **Sample from {table_name}:**\n```\n{row_str}\n```"}
+                except Exception as e:
+                    logger.debug(f"Sample failed for {table_name}: {e}")
+                    pass
             return {"response": "Could not retrieve sample data. The database may be empty or tables may have restricted access."}
         
-        return {"response": f"**Neuro-Fabric Chat**\n\nI can help you explore your database. Try asking:\n\n• *How many rows in [table]?*\n• *List all tables*\n• *Show revenue stats*\n• *Sample from [table]*\n\nAdd `GOOGLE_API_KEY` to `.env` for AI-powered responses!"}
+        return {"response": _CHAT_HELP}
     except Exception as e:
         logger.error(f"Smart chat error: {e}")
         return {"response": f"Error: {e}"}
@@ -1140,9 +1248,15 @@ async def reset_chat():
 # ── Artifacts ────────────────────────────────────────────────────────────────
 @app.get("/api/artifacts")
 async def get_artifacts():
-    OUTPUTS_DIR.mkdir(parents=True, exist_ok=True)
-    return [{"path": str(p), "name": p.name, "size_kb": round(p.stat().st_size/1024, 1),
-             "type": p.suffix.lstrip(".")} for p in sorted(OUTPUTS_DIR.glob("*.*"))]
+    # OUTPUTS_DIR is created by core.config; scandir entries carry their own stat
+    try:
+        with os.scandir(OUTPUTS_DIR) as it:
+            entries = [e for e in it if "." in e.name and e.is_file()]
+    except FileNotFoundError:
+        return []
+    entries.sort(key=lambda e: e.name)
+    return [{"path": e.path, "name": e.name, "size_kb": round(e.stat().st_size/1024, 1),
+             "type": e.name.rpartition(".")[2]} for e in entries]
 
 @app.get("/api/artifacts/download/{filename}")
 async def download_artifact(filename: str):
@@ -1151,8 +1265,7 @@ async def download_artifact(filename: str):
     return FileResponse(path, filename=filename)
 
 # ── Analytics ────────────────────────────────────────────────────────────────
-@app.get("/api/analytics/overview")
-async def analytics_overview():
+def _analytics_overview():
     """Generate dynamic analytics overview from the connected database."""
     try:
         from core.db_connectors import get_inspector, list_schemas, DuckDBEngine
@@ -1218,123 +1331,122 @@ async def analytics_overview():
             "tables_found": list(all_tables.keys())[:10]
         }
         
-        with engine.connect() as c:
-            # Orders analytics
-            if orders_table:
-                sn, tn = orders_table
-                try:
-                    q = f'"{sn}"."{tn}"' if sn != "main" else f'"{tn}"'
-                    if isinstance(engine, DuckDBEngine):
-                        orders = c.execute(f"SELECT COUNT(*), COUNT(DISTINCT customer_id) FROM {q}").fetchone()
-                        status = c.execute(f"SELECT order_status, COUNT(*) FROM {q} GROUP BY 1 ORDER BY 2 DESC").fetchall()
-                    else:
-                        orders = c.execute(text(f"SELECT COUNT(*), COUNT(DISTINCT customer_id) FROM {q}")).fetchone()
-                        status = c.execute(text(f"SELECT order_status, COUNT(*) FROM {q} GROUP BY 1 ORDER BY 2 DESC")).fetchall()
-                    result["total_orders"] = orders[0]
-                    result["unique_customers"] = orders[1]
-                    result["order_status"] = {r[0]: r[1] for r in status} if status else {}
-                except Exception as e:
-                    logger.debug(f"Orders analytics failed: {e}")
-            
-            # Revenue from order_items or similar
-            if order_items_table:
-                sn, tn = order_items_table
-                try:
-                    q = f'"{sn}"."{tn}"' if sn != "main" else f'"{tn}"'
-                    # Try to find price column
-                    cols = inspector.get_columns(tn, schema=sn)
-                    price_col = None
-                    for col in cols:
-                        col_name = col['name'].lower()
-                        if 'price' in col_name or 'value' in col_name or 'amount' in col_name:
-                            price_col = col['name']
-                            break
-                    
-                    if price_col:
-                        if isinstance(engine, DuckDBEngine):
-                            rev = c.execute(f"SELECT COALESCE(SUM(\"{price_col}\"),0), COALESCE(AVG(\"{price_col}\"),0) FROM {q}").fetchone()
-                        else:
-                            rev = c.execute(text(f"SELECT COALESCE(SUM(\"{price_col}\"),0), COALESCE(AVG(\"{price_col}\"),0) FROM {q}")).fetchone()
-                        result["total_revenue"] = round(float(rev[0]), 2)
-                        result["avg_item_price"] = round(float(rev[1]), 2)
-                except Exception as e:
-                    logger.debug(f"Revenue analytics failed: {e}")
-            
-            # Products count
-            if products_table:
-                sn, tn = products_table
-                try:
-                    q = f'"{sn}"."{tn}"' if sn != "main" else f'"{tn}"'
-                    if isinstance(engine, DuckDBEngine):
-                        products = c.execute(f"SELECT COUNT(*) FROM {q}").fetchone()
-                    else:
-                        products = c.execute(text(f"SELECT COUNT(*) FROM {q}")).fetchone()
-                    result["total_products"] = products[0]
-                except Exception as e:
-                    logger.debug(f"Products analytics failed: {e}")
-            
-            # Sellers count
-            if sellers_table:
-                sn, tn = sellers_table
-                try:
-                    q = f'"{sn}"."{tn}"' if sn != "main" else f'"{tn}"'
-                    if isinstance(engine, DuckDBEngine):
-                        sellers = c.execute(f"SELECT COUNT(*) FROM {q}").fetchone()
-                    else:
-                        sellers = c.execute(text(f"SELECT COUNT(*) FROM {q}")).fetchone()
-                    result["total_sellers"] = sellers[0]
-                except Exception as e:
-                    logger.debug(f"Sellers analytics failed: {e}")
-            
-            # Reviews analytics
-            if reviews_table:
-                sn, tn = reviews_table
-                try:
-                    q = f'"{sn}"."{tn}"' if sn != "main" else f'"{tn}"'
-                    # Try to find score/rating column
-                    cols = inspector.get_columns(tn, schema=sn)
-                    score_col = None
-                    for col in cols:
-                        col_name = col['name'].lower()
-                        if 'score' in col_name or 'rating' in col_name or 'star' in col_name:
-                            score_col = col['name']
-                            break
-                    
-                    if score_col:
-                        if isinstance(engine, DuckDBEngine):
-                            reviews = c.execute(f"SELECT COUNT(*), COALESCE(AVG(\"{score_col}\"),0) FROM {q}").fetchone()
-                            dist = c.execute(f"SELECT \"{score_col}\", COUNT(*) FROM {q} WHERE \"{score_col}\" IS NOT NULL GROUP BY 1 ORDER BY 1 DESC").fetchall()
-                        else:
-                            reviews = c.execute(text(f"SELECT COUNT(*), COALESCE(AVG(\"{score_col}\"),0) FROM {q}")).fetchone()
-                            dist = c.execute(text(f"SELECT \"{score_col}\", COUNT(*) FROM {q} WHERE \"{score_col}\" IS NOT NULL GROUP BY 1 ORDER BY 1 DESC")).fetchall()
-                        result["total_reviews"] = reviews[0]
-                        result["avg_review_score"] = round(float(reviews[1]), 2)
-                        result["review_distribution"] = [{"score": int(r[0]), "count": r[1]} for r in dist] if dist else []
-                except Exception as e:
-                    logger.debug(f"Reviews analytics failed: {e}")
-            
-            # Payments analytics
-            if payments_table:
-                sn, tn = payments_table
-                try:
-                    q = f'"{sn}"."{tn}"' if sn != "main" else f'"{tn}"'
-                    cols = inspector.get_columns(tn, schema=sn)
-                    type_col = None
-                    for col in cols:
-                        col_name = col['name'].lower()
-                        if 'type' in col_name or 'method' in col_name:
-                            type_col = col['name']
-                            break
-                    
-                    if type_col:
-                        if isinstance(engine, DuckDBEngine):
-                            dist = c.execute(f"SELECT \"{type_col}\", COUNT(*) FROM {q} GROUP BY 1 ORDER BY 2 DESC LIMIT 5").fetchall()
-                        else:
-                            dist = c.execute(text(f"SELECT \"{type_col}\", COUNT(*) FROM {q} GROUP BY 1 ORDER BY 2 DESC LIMIT 5")).fetchall()
-                        
-                        result["payment_types"] = [{"type": str(r[0]), "count": r[1]} for r in dist] if dist else []
-                except Exception as e:
-                    logger.debug(f"Payments analytics failed: {e}")
+        def _money(v):
+            return round(float(v), 2)
+
+        # Scalar aggregates: (label, [(expr, result_key, convert)], qualified table)
+        scalar_parts = []
+        # Group-by distributions can't be fused: (label, sql, apply)
+        group_parts = []
+
+        # Orders analytics
+        if orders_table:
+            q = _qualify(*orders_table)
+            scalar_parts.append(("Orders", [("COUNT(*)", "total_orders", None),
+                                            ("COUNT(DISTINCT customer_id)", "unique_customers", None)], q))
+            group_parts.append(("Order status", f"SELECT order_status, COUNT(*) FROM {q} GROUP BY 1 ORDER BY 2 DESC",
+                                lambda rows: result.update(order_status={r[0]: r[1] for r in rows})))
+
+        # Revenue from order_items or similar
+        if order_items_table:
+            sn, tn = order_items_table
+            try:
+                # Try to find price column
+                cols = inspector.get_columns(tn, schema=sn)
+                price_col = None
+                for col in cols:
+                    if _PRICE_COLUMN.search(col['name'].lower()):
+                        price_col = _quote_ident(col['name'])
+                        break
+                if price_col:
+                    scalar_parts.append(("Revenue", [(f"COALESCE(SUM({price_col}),0)", "total_revenue", _money),
+                                                     (f"COALESCE(AVG({price_col}),0)", "avg_item_price", _money)],
+                                         _qualify(sn, tn)))
+            except Exception as e:
+                logger.debug(f"Revenue analytics failed: {e}")
+
+        # Products / sellers counts
+        if products_table:
+            scalar_parts.append(("Products", [("COUNT(*)", "total_products", None)], _qualify(*products_table)))
+        if sellers_table:
+            scalar_parts.append(("Sellers", [("COUNT(*)", "total_sellers", None)], _qualify(*sellers_table)))
+
+        # Reviews analytics
+        if reviews_table:
+            sn, tn = reviews_table
+            try:
+                # Try to find score/rating column
+                cols = inspector.get_columns(tn, schema=sn)
+                score_col = None
+                for col in cols:
+                    col_name = col['name'].lower()
+                    if 'score' in col_name or 'rating' in col_name or 'star' in col_name:
+                        score_col = _quote_ident(col['name'])
+                        break
+                if score_col:
+                    q = _qualify(sn, tn)
+                    scalar_parts.append(("Reviews", [("COUNT(*)", "total_reviews", None),
+                                                     (f"COALESCE(AVG({score_col}),0)", "avg_review_score", _money)], q))
+                    group_parts.append(("Review distribution",
+                                        f"SELECT {score_col}, COUNT(*) FROM {q} WHERE {score_col} IS NOT NULL GROUP BY 1 ORDER BY 1 DESC",
+                                        lambda rows: result.update(review_distribution=[{"score": int(r[0]), "count": r[1]} for r in rows])))
+            except Exception as e:
+                logger.debug(f"Reviews analytics failed: {e}")
+
+        # Payments analytics
+        if payments_table:
+            sn, tn = payments_table
+            try:
+                cols = inspector.get_columns(tn, schema=sn)
+                type_col = None
+                for col in cols:
+                    col_name = col['name'].lower()
+                    if 'type' in col_name or 'method' in col_name:
+                        type_col = _quote_ident(col['name'])
+                        break
+                if type_col:
+                    group_parts.append(("Payments",
+                                        f"SELECT {type_col}, COUNT(*) FROM {_qualify(sn, tn)} GROUP BY 1 ORDER BY 2 DESC LIMIT 5",
+                                        lambda rows: result.update(payment_types=[{"type": str(r[0]), "count": r[1]} for r in rows])))
+            except Exception as e:
+                logger.debug(f"Payments analytics failed: {e}")
+
+        def _apply(label, exprs, row):
+            for (_, key, convert), v in zip(exprs, row):
+                result[key] = convert(v) if convert else v
+
+        if scalar_parts:
+            # One planned statement: every scalar aggregate as a single-row CTE, cross-joined
+            ctes = ", ".join(
+                f"p{i} AS (SELECT {', '.join(f'{e} AS p{i}_{j}' for j, (e, _, _) in enumerate(exprs))} FROM {q})"
+                for i, (_, exprs, q) in enumerate(scalar_parts))
+            fused = f"WITH {ctes} SELECT * FROM {', '.join(f'p{i}' for i in range(len(scalar_parts)))}"
+            try:
+                with engine.connect() as c:
+                    row = c.execute(text(fused)).fetchone()
+                pos = 0
+                for label, exprs, _ in scalar_parts:
+                    _apply(label, exprs, row[pos:pos + len(exprs)])
+                    pos += len(exprs)
+            except Exception as e:
+                # One bad part (e.g. a missing column) shouldn't blank the others
+                logger.debug(f"Fused analytics query failed, running parts separately: {e}")
+                for label, exprs, q in scalar_parts:
+                    try:
+                        with engine.connect() as c:
+                            row = c.execute(text(f"SELECT {', '.join(e for e, _, _ in exprs)} FROM {q}")).fetchone()
+                        _apply(label, exprs, row)
+                    except Exception as e:
+                        logger.debug(f"{label} analytics failed: {e}")
+
+        for label, sql, apply in group_parts:
+            try:
+                with engine.connect() as c:
+                    rows = c.execute(text(sql)).fetchall()
+                if rows:
+                    apply(rows)
+            except Exception as e:
+                logger.debug(f"{label} analytics failed: {e}")
         
         # Add basic stats about the database
         result["total_tables"] = len(all_tables)
@@ -1344,6 +1456,10 @@ async def analytics_overview():
         logger.error("Analytics failed: %s", e)
         return {"error": str(e), "total_tables": 0}
 
+@app.get("/api/analytics/overview")
+async def analytics_overview():
+    return await _in_thread(_analytics_overview)
+
 # ── Supabase Setup ───────────────────────────────────────────────────────────
 @app.post("/api/supabase/setup")
 async def setup_supabase():
@@ -1527,11 +1643,131 @@ async def supabase_status():
         return {"configured": True, "connected": False, "error": str(e)}
 
 # ── Helpers ──────────────────────────────────────────────────────────────────
+_ORJSON_OPTS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+def _json_etag(obj) -> tuple[bytes, str]:
+    """Serialize obj once and derive a strong ETag from the bytes."""
+    import hashlib
+    body = orjson.dumps(obj, default=str, option=_ORJSON_OPTS)
+    return body, f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+# Caps how many blocking DB calls run in worker threads at once
+_DB_LIMITER = anyio.CapacityLimiter(8)
+
+async def _in_thread(fn, *args):
+    """Run blocking DB work in a worker thread so the event loop keeps serving."""
+    return await anyio.to_thread.run_sync(fn, *args, limiter=_DB_LIMITER)
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match", "")
+    return if_none_match.strip() == "*" or etag in [t.strip() for t in if_none_match.split(",")]
+
+def _etag_response(request: Request, body: bytes, etag: str, cache_control: str | None = None) -> Response:
+    """Send pre-serialized JSON, or an empty 304 when the client already has this ETag."""
+    headers = {"ETag": etag}
+    if cache_control:
+        headers["Cache-Control"] = cache_control
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(body, media_type="application/json", headers=headers)
+
+@functools.lru_cache(maxsize=4096)
+def _quote_ident(name: str) -> str:
+    return '"' + str(name).replace('"', '""') + '"'
+
+@functools.lru_cache(maxsize=1024)
+def _qualify(schema_name: str | None, table_name: str) -> str:
+    """Quoted table reference; DuckDB's default "main" schema is left implicit."""
+    if not schema_name or schema_name == "main":
+        return _quote_ident(table_name)
+    return f"{_quote_ident(schema_name)}.{_quote_ident(table_name)}"
+
+def _known_table(engine, table: str) -> tuple[str, str] | None:
+    """Resolve a "table" or "schema.table" path segment against the live catalog."""
+    from core.db_connectors import get_inspector, list_schemas
+    inspector = get_inspector(engine)
+    schema_name, _, table_name = table.rpartition(".")
+    for sn in ([schema_name] if schema_name else list_schemas(engine)):
+        try:
+            if table_name in inspector.get_table_names(schema=sn):
+                return (sn, table_name)
+        except Exception:
+            continue
+    return None
+
+def _duckdb_fetch(cur, sql: str, limit: int | None = None) -> tuple[list[str], list[tuple]]:
+    """Run sql on a native duckdb cursor and return (column names, rows)."""
+    cur.execute(sql)
+    if not cur.description:
+        return [], []
+    cols = [d[0] for d in cur.description]
+    return cols, (cur.fetchall() if limit is None else cur.fetchmany(limit))
+
+def _reflect_multi(inspector, kind: str, schema_name: str) -> dict | None:
+    """Batched inspector.get_multi_<kind> for one schema, or None if unsupported/failed."""
+    try:
+        return getattr(inspector, f"get_multi_{kind}")(schema=schema_name)
+    except Exception as e:
+        logger.debug(f"get_multi_{kind} failed for schema {schema_name}: {e}")
+        return None
+
+def _count_rows(engine, schema_name: str, table_name: str) -> int:
+    """Exact COUNT(*) for engines without catalog row counts."""
+    from sqlalchemy import text
+    q = _qualify(schema_name, table_name)
+    with engine.connect() as conn:
+        return conn.execute(text(f"SELECT COUNT(*) FROM {q}")).fetchone()[0]
+
+# Columns per aggregate query; wider tables are split across several scans
+_QUALITY_COLUMN_CHUNK = 256
+
+def _table_column_stats(engine, q: str, col_names: list[str]) -> tuple[int, dict[str, tuple[int, int]]]:
+    """Return (row_count, {column: (null_count, distinct_count)}) for a qualified table.
+
+    Builds ``SELECT COUNT(*), COUNT("c"), COUNT(DISTINCT "c"), ...`` so each
+    chunk of columns costs a single scan. If a chunk fails (e.g. a type
+    without equality such as Postgres json), its columns are measured one
+    by one and a failing column reports zeros.
+    """
+    from sqlalchemy import text
+    stats: dict[str, tuple[int, int]] = {}
+    if not col_names:
+        with engine.connect() as conn:
+            return conn.execute(text(f"SELECT COUNT(*) FROM {q}")).fetchone()[0], stats
+    total = 0
+    for i in range(0, len(col_names), _QUALITY_COLUMN_CHUNK):
+        chunk = col_names[i:i + _QUALITY_COLUMN_CHUNK]
+        exprs = ", ".join(f"COUNT({_quote_ident(c)}), COUNT(DISTINCT {_quote_ident(c)})" for c in chunk)
+        try:
+            with engine.connect() as conn:
+                row = conn.execute(text(f"SELECT COUNT(*), {exprs} FROM {q}")).fetchone()
+            total = row[0]
+            for j, c in enumerate(chunk):
+                stats[c] = (total - row[1 + 2 * j], row[2 + 2 * j])
+        except Exception as chunk_e:
+            logger.warning(f"Batched quality query failed for {q}, falling back per column: {chunk_e}")
+            for c in chunk:
+                try:
+                    with engine.connect() as conn:
+                        qc = _quote_ident(c)
+                        row = conn.execute(text(f"SELECT COUNT(*), COUNT({qc}), COUNT(DISTINCT {qc}) FROM {q}")).fetchone()
+                    total = row[0]
+                    stats[c] = (total - row[1], row[2])
+                except Exception as col_e:
+                    logger.warning(f"Quality check failed for column {c}: {col_e}")
+                    stats[c] = (0, 0)
+    return total, stats
+
 def _ser(obj):
-    if isinstance(obj, dict): return {k: _ser(v) for k, v in obj.items()}
-    if isinstance(obj, list): return [_ser(v) for v in obj]
-    try: json.dumps(obj); return obj
-    except: return str(obj)
+    """Return obj as-is when orjson can encode it, else a copy with unencodable leaves stringified."""
+    try: orjson.dumps(obj, option=_ORJSON_OPTS); return obj
+    except TypeError: return _ser_walk(obj)
+
+def _ser_walk(obj):
+    if isinstance(obj, dict): return {k: _ser_walk(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)): return [_ser_walk(v) for v in obj]
+    try: orjson.dumps(obj, option=_ORJSON_OPTS); return obj
+    except TypeError: return str(obj)
 
 def _ser_val(v):
     if v is None: return None
@@ -1539,12 +1775,12 @@ def _ser_val(v):
     from datetime import datetime, date
     if isinstance(v, datetime): return v.isoformat()
     if isinstance(v, date): return v.isoformat()
+    if isinstance(v, (bytes, bytearray, memoryview)): return bytes(v).hex()
     return str(v)
 
 # ── In-Memory Lineage Graph (derived from schema FK data) ────────────────────
 
-@app.get("/api/lineage/graph")
-async def lineage_graph():
+def _lineage_graph():
     """Build a lineage graph from live schema FK relationships. No Neo4j needed."""
     schema = pipeline_state.get("schema", {})
 
@@ -1587,6 +1823,8 @@ async def lineage_graph():
                         }
                 except Exception as e:
                     logger.warning(f"Lineage: failed to inspect schema {sn}: {e}")
+            # schema is the dict held by pipeline_state, filled in place above
+            _touch_state()
         except Exception as e:
             return {"nodes": [], "edges": [], "error": str(e)}
 
@@ -1613,6 +1851,10 @@ async def lineage_graph():
 
     return {"nodes": nodes, "edges": edges, "table_count": len(nodes), "relationship_count": len(edges)}
 
+@app.get("/api/lineage/graph")
+async def lineage_graph():
+    return await _in_thread(_lineage_graph)
+
 @app.get("/api/lineage/status")
 async def lineage_status():
     """Lineage is now in-memory, always available when schema is loaded."""
@@ -1901,23 +2143,100 @@ async def github_code_context():
 
 # ── Serve Frontend ───────────────────────────────────────────────────────────
 import os
-from fastapi.staticfiles import StaticFiles
 
 frontend_dist = Path(__file__).parent / "neuro-fabric" / "dist"
+
+try:
+    import brotli  # optional: adds pre-encoded br variants for static files
+except ImportError:
+    brotli = None
+
+# Files larger than this stay on disk and go out via FileResponse
+_STATIC_MAX_PRELOAD = 4 * 1024 * 1024
+# relative path -> (body, gzip body, brotli body or None, content type, etag)
+_STATIC: dict[str, tuple[bytes, bytes, bytes | None, str, str]] = {}
+_STATIC_ON_DISK: dict[str, Path] = {}
+
+def _static_file_response(request: Request, file_path: Path) -> Response:
+    """FileResponse with ETag/Last-Modified that answers If-None-Match with a 304.
+
+    Starlette's FileResponse hands the file to the server via the ASGI
+    ``http.response.pathsend`` extension when it is advertised, so the body
+    never passes through userspace buffers.
+    """
+    stat = file_path.stat()
+    media_type = mimetypes.guess_type(file_path.name)[0] or "application/octet-stream"
+    response = FileResponse(file_path, media_type=media_type, stat_result=stat)
+    etag = response.headers["etag"]
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers={
+            "ETag": etag, "Last-Modified": response.headers["last-modified"]})
+    return response
+
+def _preload_frontend() -> None:
+    """Read the built SPA into memory once, with pre-computed headers and compressed bodies."""
+    import gzip, hashlib
+    _STATIC.clear(); _STATIC_ON_DISK.clear()
+    for p in frontend_dist.rglob("*"):
+        if not p.is_file():
+            continue
+        rel = p.relative_to(frontend_dist).as_posix()
+        if p.stat().st_size > _STATIC_MAX_PRELOAD:
+            _STATIC_ON_DISK[rel] = p
+            continue
+        body = p.read_bytes()
+        ct = mimetypes.guess_type(p.name)[0] or "application/octet-stream"
+        if ct.startswith("text/") or ct in ("application/javascript", "image/svg+xml"):
+            ct += "; charset=utf-8"
+        etag = f'"{hashlib.sha1(body).hexdigest()}"'
+        body_br = brotli.compress(body, quality=11) if brotli else None
+        _STATIC[rel] = (body, gzip.compress(body, 9), body_br, ct, etag)
+    logger.info("Preloaded %d frontend files (%d served from disk)", len(_STATIC), len(_STATIC_ON_DISK))
+
 if frontend_dist.exists():
-    # Mount the /assets directory for JS/CSS
-    app.mount("/assets", StaticFiles(directory=str(frontend_dist / "assets")), name="assets")
-    
-    # Serve index.html for the root path and any unhandled paths (for SPA routing)
+    @app.on_event("startup")
+    async def preload_frontend():
+        _preload_frontend()
+
+    # Serve built files from memory; unknown paths get index.html (SPA routing)
     @app.get("/{full_path:path}")
-    async def serve_frontend(full_path: str):
-        file_path = frontend_dist / full_path
-        if file_path.exists() and file_path.is_file():
-            return FileResponse(file_path)
-        return FileResponse(frontend_dist / "index.html")
+    async def serve_frontend(full_path: str, request: Request):
+        rel = full_path.strip("/") or "index.html"
+        entry = _STATIC.get(rel)
+        if entry is None:
+            if rel in _STATIC_ON_DISK:
+                return _static_file_response(request, _STATIC_ON_DISK[rel])
+            if rel.startswith("assets/"):
+                raise HTTPException(404, "Not found")
+            entry = _STATIC.get("index.html")
+            if entry is None:
+                raise HTTPException(404, "Frontend not built")
+            rel = "index.html"
+        body, body_gz, body_br, ct, etag = entry
+        # Hashed bundles never change; the HTML shell must be revalidated
+        cache_control = "public, max-age=31536000, immutable" if rel.startswith("assets/") else "no-cache"
+        headers = {"ETag": etag, "Cache-Control": cache_control, "Vary": "Accept-Encoding"}
+        if _etag_matches(request, etag):
+            return Response(status_code=304, headers=headers)
+        accept = request.headers.get("accept-encoding", "")
+        if body_br is not None and "br" in accept and len(body_br) < len(body):
+            headers["Content-Encoding"] = "br"
+            return Response(content=body_br, media_type=ct, headers=headers)
+        if "gzip" in accept and len(body_gz) < len(body):
+            headers["Content-Encoding"] = "gzip"
+            return Response(content=body_gz, media_type=ct, headers=headers)
+        return Response(content=body, media_type=ct, headers=headers)
 
 # ── Main ─────────────────────────────────────────────────────────────────────
 if __name__ == "__main__":
     import uvicorn
     print("🧠 Neuro-Fabric API — http://localhost:8000")
-    uvicorn.run("server:app", host="0.0.0.0", port=8000, reload=True)
+    if os.getenv("ENV", "").lower() == "dev":
+        uvicorn.run("server:app", host="0.0.0.0", port=8000, reload=True)
+    else:
+        # "auto" picks uvloop + httptools when installed (see requirements.txt).
+        # pipeline_state and the response caches live in process memory, so
+        # extra workers each keep their own copy; default to a single worker.
+        uvicorn.run("server:app", host="0.0.0.0", port=8000,
+                    workers=int(os.getenv("WEB_CONCURRENCY", "1")),
+                    loop="auto", http="auto", log_level=LOG_LEVEL.lower())
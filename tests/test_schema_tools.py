@@ -0,0 +1,41 @@
+"""Reflection caches must pick up DDL made after the first describe."""
+import json
+
+import pytest
+
+from core import db_connectors
+from core.db_connectors import DuckDBEngine, clear_reflection_cache
+from tools import schema_tools
+
+
+@pytest.fixture
+def engine(tmp_path, monkeypatch):
+    eng = DuckDBEngine(tmp_path / "t.duckdb")
+    with eng.connect() as conn:
+        conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name VARCHAR)")
+    monkeypatch.setattr(schema_tools, "_get_engine", lambda db_config=None: eng)
+    yield eng
+    clear_reflection_cache(eng)
+    eng.dispose()
+
+
+def _columns(table: str) -> list[str]:
+    out = json.loads(schema_tools.describe_table.func(table, schema_name="main"))
+    return [c["name"] for c in out["columns"]["columns"]]
+
+
+def test_new_column_visible_after_run_clears_cache(engine):
+    assert _columns("items") == ["id", "name"]
+    with engine.connect() as conn:
+        conn.execute("ALTER TABLE items ADD COLUMN price DOUBLE")
+    # What schema_agent_node does at the start of every run.
+    clear_reflection_cache(engine)
+    assert _columns("items") == ["id", "name", "price"]
+
+
+def test_new_column_visible_after_inspector_ttl(engine, monkeypatch):
+    assert _columns("items") == ["id", "name"]
+    with engine.connect() as conn:
+        conn.execute("ALTER TABLE items ADD COLUMN price DOUBLE")
+    monkeypatch.setattr(db_connectors, "SCHEMA_CACHE_TTL", -1)
+    assert _columns("items") == ["id", "name", "price"]
@@ -0,0 +1,62 @@
+"""
+Background writer for export artifacts.
+
+Artifacts fall in two classes:
+  * critical — read back by the next pipeline run (the schema cache used for
+    incremental update detection); written synchronously by the caller.
+  * buffered — human-facing documentation (JSON / Markdown dictionaries);
+    handed to WRITER so the calling tool returns before the disk flush.
+
+Buffered files are written to a temporary sibling and renamed into place, so
+readers never see a partially written artifact. Pending writes are flushed
+at interpreter exit.
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import os
+import queue
+import threading
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncArtifactWriter:
+    """Queue of (path, bytes) jobs serviced by one daemon thread."""
+
+    def __init__(self) -> None:
+        self._queue: queue.Queue[tuple[Path, bytes]] = queue.Queue()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    def submit(self, path: Path, data: bytes) -> None:
+        """Enqueue a write; returns immediately."""
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="artifact-writer", daemon=True)
+                self._thread.start()
+        self._queue.put((path, data))
+
+    def flush(self) -> None:
+        """Block until every submitted write has finished."""
+        self._queue.join()
+
+    def _run(self) -> None:
+        while True:
+            path, data = self._queue.get()
+            try:
+                tmp = path.with_name(path.name + ".tmp")
+                tmp.write_bytes(data)
+                os.replace(tmp, path)
+                logger.info("Artifact flushed: %s", path)
+            except Exception as exc:
+                logger.error("Artifact write failed for %s: %s", path, exc)
+            finally:
+                self._queue.task_done()
+
+
+WRITER = AsyncArtifactWriter()
+atexit.register(WRITER.flush)
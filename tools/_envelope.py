@@ -0,0 +1,42 @@
+"""
+Pre-shaped JSON envelopes returned by the LangChain tools.
+
+Only the variable part is JSON-encoded (json.dumps of a str handles all
+escaping); the surrounding object is a constant template, so no dict is
+built or walked per call. Output matches json.dumps({...}).
+
+dump() encodes full tool results with orjson when available: compact output,
+int keys stringified, datetimes and other non-JSON values rendered with str()
+as json.dumps(default=str) would.
+"""
+
+from __future__ import annotations
+
+import json
+
+try:
+    import orjson
+except ImportError:  # stdlib fallback
+    orjson = None
+
+_ORJSON_OPTS = (orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME) if orjson is not None else 0
+
+_OK_TMPL = '{"status": "success", "path": %s}'
+_ERR_TMPL = '{"error": %s}'
+
+
+def ok(path) -> str:
+    """{"status": "success", "path": <path>}"""
+    return _OK_TMPL % json.dumps(str(path))
+
+
+def err(exc) -> str:
+    """{"error": <str(exc)>}"""
+    return _ERR_TMPL % json.dumps(str(exc))
+
+
+def dump(obj) -> str:
+    """JSON text for a tool result."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=_ORJSON_OPTS).decode()
+    return json.dumps(obj, default=str, separators=(",", ":"))
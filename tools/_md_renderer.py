@@ -0,0 +1,100 @@
+"""
+Markdown data-dictionary renderer used by write_markdown_artifact.
+
+Kept free of I/O and dynamic tricks so it can be compiled with mypyc:
+
+    pip install mypy && mypyc tools/_md_renderer.py
+
+The resulting extension module shadows this file on import; without it the
+interpreted version is used unchanged.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+_ROW_TMPL = "| `{name}` | {dtype} | {nullable} | {pk} | {fk} | {desc} |\n"
+
+
+def render_markdown(db_name: str, content: dict[str, Any], generated: str) -> str:
+    """Return the Markdown document for parsed schema/quality/documentation content."""
+    schema: dict[str, Any] = content.get("schema", {})
+    quality: dict[str, Any] = content.get("quality_report", {})
+    docs: dict[str, Any] = content.get("documentation", {})
+
+    out: list[str] = []
+    add = out.append
+
+    add(f"# Data Dictionary: {db_name}\n")
+    add(f"\n_Generated: {generated}_\n\n")
+    add("---\n\n")
+
+    for table_name, table_schema in schema.items():
+        doc: dict[str, Any] = docs.get(table_name, {})
+        qual: dict[str, Any] = quality.get(table_name, {})
+
+        add(f"## Table: `{table_name}`\n\n")
+
+        # Business summary
+        if doc.get("business_summary"):
+            add(f"**Business Summary:** {doc['business_summary']}\n\n")
+
+        # Quality overview
+        completeness = qual.get("overall_completeness")
+        row_count = qual.get("row_count") or table_schema.get("row_count")
+        if completeness is not None:
+            add(f"**Completeness:** {completeness * 100:.1f}%\n")
+        if row_count is not None:
+            add(f"**Row Count:** {row_count:,}\n")
+
+        freshness_latest = qual.get("freshness_latest")
+        if freshness_latest:
+            add(f"**Latest Record:** {freshness_latest}\n")
+        add("\n")
+
+        # Columns table
+        columns: list[dict[str, Any]] = table_schema.get("columns", [])
+        if columns:
+            add("### Columns\n\n")
+            add("| Column | Type | Nullable | PK | FK | Description |\n")
+            add("|--------|------|----------|----|----|-------------|\n")
+            col_descriptions: dict[str, Any] = doc.get("column_descriptions", {})
+            # Hot loop on wide tables: every row fills the one module-level template
+            for col in columns:
+                name = col["name"]
+                add(_ROW_TMPL.format(
+                    name=name,
+                    dtype=col.get("data_type") or col.get("type", "unknown"),
+                    nullable="Yes" if col.get("nullable") else "No",
+                    pk="✓" if col.get("is_primary_key") else "",
+                    fk="✓" if col.get("is_foreign_key") else "",
+                    desc=col_descriptions.get(name, ""),
+                ))
+            add("\n")
+
+        # FK relationships
+        fks: list[dict[str, Any]] = table_schema.get("foreign_keys", [])
+        if fks:
+            add("### Relationships\n\n")
+            for fk in fks:
+                add(f"- `{fk['column']}` → `{fk['ref_table']}.{fk['ref_column']}`\n")
+            add("\n")
+
+        # Usage recommendations
+        recommendations: list[Any] = doc.get("usage_recommendations", [])
+        if recommendations:
+            add("### Usage Recommendations\n\n")
+            for rec in recommendations:
+                add(f"- {rec}\n")
+            add("\n")
+
+        # Suggested SQL queries
+        queries: list[Any] = doc.get("suggested_queries", [])
+        if queries:
+            add("### Suggested Queries\n\n")
+            for q in queries:
+                add(f"```sql\n{q}\n```\n\n")
+
+        add("---\n\n")
+
+    return "".join(out)
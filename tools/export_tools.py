@@ -13,6 +13,14 @@ from pathlib import Path
 from langchain_core.tools import tool
 
 from core.config import OUTPUTS_DIR
+from tools._async_writer import WRITER
+from tools._envelope import err, ok
+from tools._md_renderer import render_markdown
+
+try:
+    import orjson
+except ImportError:  # stdlib fallback
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
@@ -21,6 +29,46 @@ def _timestamp() -> str:
     return datetime.now().strftime("%Y%m%d_%H%M%S")
 
 
+# The stdlib encoder is built once and reused. Artifacts come from json.loads,
+# so they can't contain cycles and the circular-reference check is skipped.
+_ENCODER = json.JSONEncoder(indent=2, ensure_ascii=False, default=str, check_circular=False)
+
+
+def _encode_json(obj) -> bytes:
+    """Indented UTF-8 JSON bytes for obj."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return _ENCODER.encode(obj).encode("utf-8")
+
+
+# The orchestrator usually passes the same blob to the JSON and Markdown
+# writers back to back; remember the last parse so the second call skips it.
+_LAST_PARSE: tuple[str, dict] | None = None
+
+
+def _parse(content_json: str) -> dict:
+    """json.loads with a one-entry cache keyed by the input string."""
+    global _LAST_PARSE
+    last = _LAST_PARSE
+    if last is not None and (last[0] is content_json or last[0] == content_json):
+        return last[1]
+    content = json.loads(content_json)
+    _LAST_PARSE = (content_json, content)
+    return content
+
+
+def _write_md_from_dict(db_name: str, content: dict) -> Path:
+    """Render the Markdown dictionary for already-parsed content and queue the write."""
+    now = datetime.now()
+    document = render_markdown(db_name, content, f"{now:%Y-%m-%d %H:%M:%S}")
+
+    filename = f"{db_name}_{now:%Y%m%d_%H%M%S}.md"
+    path = OUTPUTS_DIR / filename
+    WRITER.submit(path, document.encode("utf-8"))
+    logger.info("Markdown artifact queued: %s", path)
+    return path
+
+
 # ---------------------------------------------------------------------------
 # Tool: write_json_artifact
 # ---------------------------------------------------------------------------
@@ -39,15 +87,16 @@ def write_json_artifact(db_name: str, content_json: str) -> str:
         JSON with the output file path.
     """
     try:
-        content = json.loads(content_json)
+        content = _parse(content_json)
         filename = f"{db_name}_{_timestamp()}.json"
         path = OUTPUTS_DIR / filename
-        path.write_text(json.dumps(content, indent=2, default=str), encoding="utf-8")
-        logger.info("JSON artifact written: %s", path)
-        return json.dumps({"status": "success", "path": str(path)})
+        # Documentation artifacts are buffered; the write completes in the background.
+        WRITER.submit(path, _encode_json(content))
+        logger.info("JSON artifact queued: %s", path)
+        return ok(path)
     except Exception as exc:
         logger.error("write_json_artifact failed: %s", exc)
-        return json.dumps({"error": str(exc)})
+        return err(exc)
 
 
 # ---------------------------------------------------------------------------
@@ -68,93 +117,11 @@ def write_markdown_artifact(db_name: str, content_json: str) -> str:
         JSON with the output file path.
     """
     try:
-        content = json.loads(content_json)
-        schema: dict = content.get("schema", {})
-        quality: dict = content.get("quality_report", {})
-        docs: dict = content.get("documentation", {})
-
-        lines: list[str] = [
-            f"# Data Dictionary: {db_name}",
-            f"\n_Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}_\n",
-            "---\n",
-        ]
-
-        for table_name, table_schema in schema.items():
-            doc = docs.get(table_name, {})
-            qual = quality.get(table_name, {})
-
-            lines.append(f"## Table: `{table_name}`\n")
-
-            # Business summary
-            if doc.get("business_summary"):
-                lines.append(f"**Business Summary:** {doc['business_summary']}\n")
-
-            # Quality overview
-            completeness = qual.get("overall_completeness")
-            row_count = qual.get("row_count") or table_schema.get("row_count")
-            if completeness is not None:
-                lines.append(f"**Completeness:** {completeness * 100:.1f}%")
-            if row_count is not None:
-                lines.append(f"**Row Count:** {row_count:,}")
-
-            freshness_latest = qual.get("freshness_latest")
-            if freshness_latest:
-                lines.append(f"**Latest Record:** {freshness_latest}")
-            lines.append("")
-
-            # Columns table
-            columns = table_schema.get("columns", [])
-            if columns:
-                lines.append("### Columns\n")
-                lines.append("| Column | Type | Nullable | PK | FK | Description |")
-                lines.append("|--------|------|----------|----|----|-------------|")
-                col_descriptions = doc.get("column_descriptions", {})
-                for col in columns:
-                    pk = "✓" if col.get("is_primary_key") else ""
-                    fk = "✓" if col.get("is_foreign_key") else ""
-                    nullable = "Yes" if col.get("nullable") else "No"
-                    desc = col_descriptions.get(col["name"], "")
-                    dtype = col.get("data_type") or col.get("type", "unknown")
-                    lines.append(
-                        f"| `{col['name']}` | {dtype} | {nullable} | {pk} | {fk} | {desc} |"
-                    )
-                lines.append("")
-
-            # FK relationships
-            fks = table_schema.get("foreign_keys", [])
-            if fks:
-                lines.append("### Relationships\n")
-                for fk in fks:
-                    lines.append(
-                        f"- `{fk['column']}` → `{fk['ref_table']}.{fk['ref_column']}`"
-                    )
-                lines.append("")
-
-            # Usage recommendations
-            recommendations = doc.get("usage_recommendations", [])
-            if recommendations:
-                lines.append("### Usage Recommendations\n")
-                for rec in recommendations:
-                    lines.append(f"- {rec}")
-                lines.append("")
-
-            # Suggested SQL queries
-            queries = doc.get("suggested_queries", [])
-            if queries:
-                lines.append("### Suggested Queries\n")
-                for q in queries:
-                    lines.append(f"```sql\n{q}\n```\n")
-
-            lines.append("---\n")
-
-        filename = f"{db_name}_{_timestamp()}.md"
-        path = OUTPUTS_DIR / filename
-        path.write_text("\n".join(lines), encoding="utf-8")
-        logger.info("Markdown artifact written: %s", path)
-        return json.dumps({"status": "success", "path": str(path)})
+        path = _write_md_from_dict(db_name, _parse(content_json))
+        return ok(path)
     except Exception as exc:
         logger.error("write_markdown_artifact failed: %s", exc)
-        return json.dumps({"error": str(exc)})
+        return err(exc)
 
 
 # ---------------------------------------------------------------------------
@@ -172,14 +139,20 @@ def write_schema_cache(content_json: str) -> str:
     Returns:
         JSON with cache file path.
     """
-    from core.config import SCHEMA_CACHE_FILE
+    from core.config import SCHEMA_CACHE_DIR
+    from core.db_connectors import clear_reflection_cache
+    from core.schema_cache import save_schema_cache
     try:
         content = json.loads(content_json)
-        SCHEMA_CACHE_FILE.write_text(json.dumps(content, indent=2, default=str), encoding="utf-8")
-        return json.dumps({"status": "success", "path": str(SCHEMA_CACHE_FILE)})
+        # Critical artifact: the next run diffs against it, so write synchronously.
+        # Reflected column lists are memoized per inspector; drop them once
+        # the snapshot shows the schema actually moved.
+        if save_schema_cache(content):
+            clear_reflection_cache()
+        return ok(SCHEMA_CACHE_DIR)
     except Exception as exc:
         logger.error("write_schema_cache failed: %s", exc)
-        return json.dumps({"error": str(exc)})
+        return err(exc)
 
 
 # ---------------------------------------------------------------------------
@@ -5,27 +5,393 @@ Performs per-column and per-table statistical analysis via SQL.
 
 from __future__ import annotations
 
+import contextlib
+import decimal
+import functools
+import inspect
 import json
 import logging
-from typing import Any
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
+from decimal import Decimal
+from typing import Any, Iterator
 
+from cachetools import TTLCache
 from langchain_core.tools import tool
 from sqlalchemy import text
+from sqlalchemy.sql.elements import TextClause
 
-from core.db_connectors import get_engine
+from core.config import TOOL_RESULT_TTL
+from core.db_connectors import estimate_row_count, get_engine, parse_db_config
+from tools._envelope import dump, err
 
 logger = logging.getLogger(__name__)
 
 
+# Aggregate expressions per generated SELECT; below Postgres's target-list limit.
+_MAX_SELECT_EXPRS = 1000
+
+# Upper bound on concurrent per-column queries issued by the batch tools;
+# stays below the URL engines' pool size (core.db_connectors.POOL_SIZE).
+MAX_PARALLEL_QUERIES = 8
+
+
+# compute_table_completeness results keyed by (id(engine), schema, table,
+# sample clause); each entry carries the table's modification marker (see
+# _change_marker) so a written table is recomputed before the TTL runs out.
+# Engines without a marker never reuse an entry older than TOOL_RESULT_TTL.
+COMPLETENESS_CACHE_TTL = 600
+_completeness_cache: TTLCache = TTLCache(maxsize=256, ttl=COMPLETENESS_CACHE_TTL)
+_completeness_lock = threading.Lock()
+
+# Freshness answers go stale fastest, so they never outlive this window.
+FRESHNESS_RESULT_TTL = min(TOOL_RESULT_TTL, 30)
+
+# Whole-table analyze_table_profile results, keyed and invalidated like the
+# completeness cache; analyze_column_nulls/analyze_column_stats answer from
+# them so single-column follow-ups don't rescan the table, but only from
+# profiles younger than their own TOOL_RESULT_TTL.
+PROFILE_CACHE_TTL = 600
+_profile_cache: TTLCache = TTLCache(maxsize=256, ttl=PROFILE_CACHE_TTL)
+_profile_lock = threading.Lock()
+
+class _ConnectionSession:
+    """
+    Connections opened by shared_connection(), one per worker thread.
+
+    Agent runtimes execute each tool call on an executor thread, and a
+    connection must not be used from two threads, so every thread that
+    calls a tool inside the block gets its own connection and keeps it
+    for the rest of the block.
+    """
+
+    def __init__(self, engine) -> None:
+        self.engine = engine
+        self._conns: dict[int, Any] = {}
+        self._lock = threading.Lock()
+
+    def connection(self) -> Any:
+        ident = threading.get_ident()
+        with self._lock:
+            conn = self._conns.get(ident)
+        if conn is None:
+            conn = self.engine.connect()
+            with self._lock:
+                self._conns[ident] = conn
+        return conn
+
+    def close(self) -> None:
+        with self._lock:
+            conns, self._conns = list(self._conns.values()), {}
+        for conn in conns:
+            try:
+                conn.close()
+            except Exception as exc:
+                logger.warning("Closing shared quality connection failed: %s", exc)
+
+
+# Set by shared_connection(); copied into the executor threads that run tool
+# calls, which then draw their per-thread connection from it.
+_CONN: ContextVar[_ConnectionSession | None] = ContextVar("quality_tools_conn", default=None)
+
+
 def _engine(db_config: dict):
     return get_engine(db_config or {})
 
 
+@functools.lru_cache(maxsize=32)
+def _engine_cached(db_config_json: str):
+    """Engine for a raw db_config_json string; repeat calls skip parsing and lookup."""
+    return get_engine(parse_db_config(db_config_json))
+
+
+@contextlib.contextmanager
+def _connect(engine) -> Iterator[Any]:
+    """This thread's shared_connection() connection if the engine matches, else a fresh one."""
+    session = _CONN.get()
+    if session is None or session.engine is not engine:
+        with engine.connect() as conn:
+            yield conn
+        return
+    conn = session.connection()
+    try:
+        yield conn
+    finally:
+        # End the implicit transaction: a failed statement aborts it on
+        # Postgres, and a held connection should not sit "idle in
+        # transaction" through the LLM turns between tool calls.
+        if hasattr(conn, "rollback") and conn.in_transaction():
+            conn.rollback()
+
+
+@contextlib.contextmanager
+def shared_connection(db_config: dict | None = None) -> Iterator[None]:
+    """
+    Reuse one pooled connection per worker thread for the quality tools
+    invoked inside this block.
+
+    Replaces a checkout/checkin per tool call with one per thread for the
+    whole batch; at most the agent's max_concurrency connections are held,
+    and all of them are returned to the pool when the block exits.
+    """
+    session = _ConnectionSession(_engine(db_config or {}))
+    token = _CONN.set(session)
+    try:
+        yield
+    finally:
+        _CONN.reset(token)
+        session.close()
+
+
+# Seed for TABLESAMPLE ... REPEATABLE so sampled results are reproducible.
+_SAMPLE_SEED = 42
+
+# Sanity bound on identifier length (Postgres truncates at 63 bytes, MSSQL at 128).
+_MAX_IDENT_LEN = 128
+
+
+def _ttl_cached(ttl: int):
+    """
+    Serve identical repeat calls of a tool function from a TTLCache.
+
+    The key is the full bound argument tuple (db_config_json included), so
+    different connections never share entries. Error envelopes are not
+    cached; ttl <= 0 leaves the function uncached.
+    """
+    def decorator(fn):
+        if ttl <= 0:
+            return fn
+        sig = inspect.signature(fn)
+        cache: TTLCache = TTLCache(maxsize=512, ttl=ttl)
+        lock = threading.Lock()
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            bound = sig.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = tuple(bound.arguments.items())
+            with lock:
+                cached = cache.get(key)
+            if cached is not None:
+                return cached
+            result = fn(*args, **kwargs)
+            if not result.startswith('{"error"'):
+                with lock:
+                    cache[key] = result
+            return result
+
+        return wrapper
+    return decorator
+
+
+@functools.lru_cache(maxsize=4096)
+def _quote_ident(name: str) -> str:
+    """
+    Double-quoted identifier, validated once per distinct name.
+
+    Quotes are doubled and ':' is escaped so text() can't mistake part of a
+    name for a bind parameter; empty, NUL-containing or oversized names are
+    rejected with ValueError.
+    """
+    name = str(name)
+    if not name or "\x00" in name or len(name) > _MAX_IDENT_LEN:
+        raise ValueError(f"Invalid identifier: {name!r}")
+    return '"' + name.replace('"', '""').replace(":", "\\:") + '"'
+
+
+@functools.lru_cache(maxsize=1024)
+def _qualify(schema_name: str, table_name: str) -> str:
+    return f"{_quote_ident(schema_name)}.{_quote_ident(table_name)}"
+
+
+def _sample_clause(engine, db_config: dict, method: str = "SYSTEM") -> str:
+    """
+    Sampling suffix for a FROM target when db_config["sample_pct"] is set.
+
+    TABLESAMPLE SYSTEM reads roughly sample_pct% of the table's pages, so
+    runtime stops growing with table size. Rates, mean and stddev stay close
+    to the full-table values once a few hundred thousand rows are sampled;
+    total_rows and distinct_count then describe the sample only. Percentile
+    queries pass method="BERNOULLI", which samples rows uniformly instead of
+    whole pages. A fixed REPEATABLE seed makes repeat audits and self-joins
+    see the same sample. Dialects without a known syntax scan the full table.
+    Aliases go before the clause: FROM tbl AS t TABLESAMPLE ...
+    """
+    try:
+        pct = float(db_config.get("sample_pct") or 0)
+    except (TypeError, ValueError):
+        return ""
+    if not 0 < pct < 100:
+        return ""
+    dialect = engine.dialect.name
+    if dialect == "postgresql":
+        return f" TABLESAMPLE {method} ({pct:g}) REPEATABLE ({_SAMPLE_SEED})"
+    if dialect == "duckdb":
+        return f" TABLESAMPLE {method} ({pct:g}%) REPEATABLE ({_SAMPLE_SEED})"
+    return ""
+
+
+@functools.lru_cache(maxsize=1024)
+def _sql(statement: str) -> TextClause:
+    """
+    text() for a fully-rendered statement, built once per distinct string.
+
+    Reusing the same TextClause skips re-scanning for bind parameters and
+    lets the engine's compiled cache hit on repeat audits.
+    """
+    return text(statement)
+
+
+def _has_leading_index(engine, table_name: str, column_name: str, schema_name: str) -> bool:
+    """True if an index or the primary key has column_name as its first column."""
+    from core.db_connectors import get_inspector
+    try:
+        inspector = get_inspector(engine)
+        pk = inspector.get_pk_constraint(table_name, schema=schema_name) or {}
+        leading = [pk.get("constrained_columns") or []]
+        leading += [ix.get("column_names") or [] for ix in inspector.get_indexes(table_name, schema=schema_name)]
+    except Exception as exc:
+        logger.debug("Index lookup failed for %s.%s: %s", schema_name, table_name, exc)
+        return False
+    return any(cols and cols[0] == column_name for cols in leading)
+
+
+def _cached_profile(
+    engine, schema_name: str, table_name: str, sample: str, max_age: float | None = None,
+) -> dict[str, Any] | None:
+    """
+    Cached table profile, or None if absent, expired, written to since, or
+    older than max_age seconds (see _entry_fresh).
+    """
+    with _profile_lock:
+        cached = _profile_cache.get((id(engine), schema_name, table_name, sample))
+    if cached is None:
+        return None
+    if not _entry_fresh(cached, _change_marker(engine, schema_name, table_name), max_age):
+        return None
+    return cached[2]
+
+
+# Per-table write counters; n_live_tup also moves on TRUNCATE, which the
+# tuple counters don't see.
+_PG_CHANGE_MARKER = text(
+    "SELECT n_tup_ins + n_tup_upd + n_tup_del, n_live_tup FROM pg_stat_user_tables "
+    "WHERE schemaname = :schema AND relname = :table"
+)
+
+
+def _change_marker(engine, schema_name: str, table_name: str) -> tuple | None:
+    """
+    Value that moves whenever the table is written, or None if the engine has none.
+
+    Postgres keeps per-table insert/update/delete counters, so UPDATEs that
+    leave the row count alone still invalidate. DuckDB keeps no such
+    counter; callers then bound reuse by age instead.
+    """
+    if engine.dialect.name != "postgresql":
+        return None
+    try:
+        with _connect(engine) as conn:
+            row = conn.execute(_PG_CHANGE_MARKER, {"schema": schema_name, "table": table_name}).fetchone()
+    except Exception as exc:
+        logger.debug("Change marker lookup failed for %s.%s: %s", schema_name, table_name, exc)
+        return None
+    return tuple(row) if row is not None else None
+
+
+def _entry_fresh(entry: tuple | None, marker: tuple | None, max_age: float | None = None) -> bool:
+    """
+    True if a (marker, stored_at, value) cache entry may be served.
+
+    The marker must match; without one the entry is only trusted for
+    TOOL_RESULT_TTL seconds, like the tools' own result cache.
+    """
+    if entry is None or entry[0] != marker:
+        return False
+    if marker is None:
+        max_age = TOOL_RESULT_TTL if max_age is None else min(max_age, TOOL_RESULT_TTL)
+    return max_age is None or time.monotonic() - entry[1] <= max_age
+
+
+# Below this many rows (catalog estimate) distinct counts are exact: the
+# sketch saves little there and its error (several percent) is large
+# enough to mislead cardinality and key checks.
+APPROX_DISTINCT_MIN_ROWS = 1_000_000
+
+
+@functools.lru_cache(maxsize=32)
+def _approx_distinct_template(engine) -> str | None:
+    """
+    HyperLogLog distinct-count format string for the engine, or None.
+
+    Sketches need constant memory instead of a hash table sized by
+    cardinality: DuckDB ships approx_count_distinct, Postgres needs the hll
+    extension, probed once per engine.
+    """
+    dialect = engine.dialect.name
+    if dialect == "duckdb":
+        return "approx_count_distinct({col})"
+    if dialect == "postgresql":
+        try:
+            with _connect(engine) as conn:
+                has_hll = conn.execute(
+                    _sql("SELECT EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'hll')")
+                ).scalar()
+        except Exception as exc:
+            logger.debug("hll extension probe failed: %s", exc)
+            has_hll = False
+        if has_hll:
+            return "hll_cardinality(hll_add_agg(hll_hash_any({col})))::bigint"
+    return None
+
+
+def _distinct_count_template(engine, schema_name: str, table_name: str) -> tuple[str, bool]:
+    """
+    (format string, is_approximate) for a column's distinct count.
+
+    The sketch is only used for tables the catalog puts at
+    APPROX_DISTINCT_MIN_ROWS or more; smaller or unestimated tables count
+    exactly.
+    """
+    sketch = _approx_distinct_template(engine)
+    if sketch is not None:
+        try:
+            rows = estimate_row_count(engine, schema_name, table_name)
+        except Exception as exc:
+            logger.debug("Row estimate failed for %s.%s: %s", schema_name, table_name, exc)
+            rows = None
+        if rows is not None and rows >= APPROX_DISTINCT_MIN_ROWS:
+            return sketch, True
+    return "COUNT(DISTINCT {col})", False
+
+
+def _central_moments(n, s1, s2, s3, s4) -> tuple[float, float]:
+    """
+    Third and fourth central moments from raw power sums.
+
+    Done in Decimal: Postgres returns exact NUMERIC sums, and the expansion
+    subtracts large nearly-equal terms that would cancel badly in floats.
+    """
+    if not n:
+        return 0.0, 0.0
+    with decimal.localcontext() as ctx:
+        ctx.prec = 60
+        n, s1, s2, s3, s4 = (Decimal(str(v or 0)) for v in (n, s1, s2, s3, s4))
+        mu = s1 / n
+        e2, e3, e4 = s2 / n, s3 / n, s4 / n
+        m3 = e3 - 3 * mu * e2 + 2 * mu ** 3
+        m4 = e4 - 4 * mu * e3 + 6 * mu ** 2 * e2 - 3 * mu ** 4
+        return float(m3), float(m4)
+
+
 # ---------------------------------------------------------------------------
 # Tool: analyze_column_nulls
 # ---------------------------------------------------------------------------
 
 @tool
+@_ttl_cached(TOOL_RESULT_TTL)
 def analyze_column_nulls(
     table_name: str,
     column_name: str,
@@ -44,31 +410,46 @@ def analyze_column_nulls(
     Returns:
         JSON with null_count, total_rows, null_rate.
     """
-    db_config = json.loads(db_config_json)
-    engine = _engine(db_config)
+    db_config = parse_db_config(db_config_json)
+    engine = _engine_cached(db_config_json)
+    sample = _sample_clause(engine, db_config)
     try:
-        q = text(
+        profile = _cached_profile(engine, schema_name, table_name, sample, max_age=TOOL_RESULT_TTL)
+        if profile is not None and column_name in profile["columns"]:
+            total = profile["total_rows"] or 1
+            null_count = profile["columns"][column_name]["null_count"]
+            return dump({
+                "table": table_name,
+                "column": column_name,
+                "total_rows": total,
+                "null_count": null_count,
+                "null_rate": round(null_count / total, 4),
+                **({"sample_pct": db_config["sample_pct"]} if sample else {}),
+            })
+        col, tbl = _quote_ident(column_name), _qualify(schema_name, table_name) + sample
+        q = _sql(
             f"""
             SELECT
                 COUNT(*) AS total_rows,
-                COUNT(*) FILTER (WHERE "{column_name}" IS NULL) AS null_count
-            FROM "{schema_name}"."{table_name}"
+                COUNT(*) FILTER (WHERE {col} IS NULL) AS null_count
+            FROM {tbl}
             """
         )
-        with engine.connect() as conn:
+        with _connect(engine) as conn:
             row = conn.execute(q).mappings().one()
         total = row["total_rows"] or 1
         null_count = row["null_count"]
-        return json.dumps({
+        return dump({
             "table": table_name,
             "column": column_name,
             "total_rows": total,
             "null_count": null_count,
             "null_rate": round(null_count / total, 4),
+            **({"sample_pct": db_config["sample_pct"]} if sample else {}),
         })
     except Exception as exc:
         logger.error("analyze_column_nulls failed: %s", exc)
-        return json.dumps({"error": str(exc)})
+        return err(exc)
 
 
 # ---------------------------------------------------------------------------
@@ -76,6 +457,7 @@ def analyze_column_nulls(
 # ---------------------------------------------------------------------------
 
 @tool
+@_ttl_cached(TOOL_RESULT_TTL)
 def analyze_column_stats(
     table_name: str,
     column_name: str,
@@ -85,6 +467,9 @@ def analyze_column_stats(
     """
     Compute distinct count, min, max, mean, and stddev for a column.
     Numeric statistics are only returned for numeric/date columns.
+    distinct_count is exact below a million rows; larger tables use a
+    HyperLogLog estimate where the engine supports one (flagged by
+    distinct_count_approx).
 
     Args:
         table_name: Target table.
@@ -95,49 +480,241 @@ def analyze_column_stats(
     Returns:
         JSON with distinct_count, min_value, max_value, mean_value, std_dev.
     """
-    db_config = json.loads(db_config_json)
-    engine = _engine(db_config)
+    db_config = parse_db_config(db_config_json)
+    engine = _engine_cached(db_config_json)
+    sample = _sample_clause(engine, db_config)
     try:
-        # Cast-safe approach: attempt numeric stats, catch if non-numeric
-        q_base = text(
+        profile = _cached_profile(engine, schema_name, table_name, sample, max_age=TOOL_RESULT_TTL)
+        if profile is not None and column_name in profile["columns"]:
+            stats = profile["columns"][column_name]
+            return dump({
+                "table": table_name,
+                "column": column_name,
+                "distinct_count": stats["distinct_count"],
+                "distinct_count_approx": profile["distinct_count_approx"],
+                "min_value": stats["min_value"],
+                "max_value": stats["max_value"],
+                "mean_value": stats["mean_value"],
+                "std_dev": stats["std_dev"],
+                **({"sample_pct": db_config["sample_pct"]} if sample else {}),
+            })
+        col, tbl = _quote_ident(column_name), _qualify(schema_name, table_name) + sample
+        distinct_tmpl, distinct_approx = _distinct_count_template(engine, schema_name, table_name)
+        base_exprs = f"""
+                {distinct_tmpl.format(col=col)} AS distinct_count,
+                COUNT({col}) AS nonnull_count,
+                MIN({col}::text) AS min_value,
+                MAX({col}::text) AS max_value"""
+        # One scan for everything; the numeric cast fails for non-numeric
+        # columns, in which case only the base aggregates are re-run.
+        q_all = _sql(
             f"""
-            SELECT
-                COUNT(DISTINCT "{column_name}") AS distinct_count,
-                MIN("{column_name}"::text) AS min_value,
-                MAX("{column_name}"::text) AS max_value
-            FROM "{schema_name}"."{table_name}"
+            SELECT{base_exprs},
+                AVG({col}::numeric) AS mean_value,
+                STDDEV({col}::numeric) AS std_dev
+            FROM {tbl}
             """
         )
-        q_numeric = text(
+        q_base = _sql(
             f"""
-            SELECT
-                AVG("{column_name}"::numeric) AS mean_value,
-                STDDEV("{column_name}"::numeric) AS std_dev
-            FROM "{schema_name}"."{table_name}"
+            SELECT{base_exprs}
+            FROM {tbl}
             """
         )
-        with engine.connect() as conn:
-            base_row = conn.execute(q_base).mappings().one()
+        with _connect(engine) as conn:
             try:
-                num_row = conn.execute(q_numeric).mappings().one()
-                mean_value = float(num_row["mean_value"]) if num_row["mean_value"] is not None else None
-                std_dev = float(num_row["std_dev"]) if num_row["std_dev"] is not None else None
+                base_row = conn.execute(q_all).mappings().one()
+                mean_value = float(base_row["mean_value"]) if base_row["mean_value"] is not None else None
+                std_dev = float(base_row["std_dev"]) if base_row["std_dev"] is not None else None
             except Exception:
+                conn.rollback()
+                base_row = conn.execute(q_base).mappings().one()
                 mean_value = None
                 std_dev = None
 
-        return json.dumps({
+        return dump({
             "table": table_name,
             "column": column_name,
-            "distinct_count": base_row["distinct_count"],
+            # A sketch can overshoot slightly; never report more values than exist
+            "distinct_count": min(base_row["distinct_count"], base_row["nonnull_count"]),
+            "distinct_count_approx": distinct_approx,
             "min_value": base_row["min_value"],
             "max_value": base_row["max_value"],
             "mean_value": mean_value,
             "std_dev": std_dev,
+            **({"sample_pct": db_config["sample_pct"]} if sample else {}),
         })
     except Exception as exc:
         logger.error("analyze_column_stats failed: %s", exc)
-        return json.dumps({"error": str(exc)})
+        return err(exc)
+
+
+# ---------------------------------------------------------------------------
+# Tool: analyze_table_column_stats
+# ---------------------------------------------------------------------------
+
+@tool
+def analyze_table_column_stats(
+    table_name: str,
+    column_names: str = "",
+    schema_name: str = "public",
+    db_config_json: str = "{}",
+) -> str:
+    """
+    Run analyze_column_stats for many columns of a table at once.
+    Columns are queried concurrently on separate pooled connections.
+
+    Args:
+        table_name: Target table.
+        column_names: Comma-separated columns (if empty, uses all columns).
+        schema_name: Schema containing the table (default: 'public').
+        db_config_json: JSON string with optional db connection config.
+
+    Returns:
+        JSON with a per-column map of analyze_column_stats results.
+    """
+    db_config = parse_db_config(db_config_json)
+    engine = _engine_cached(db_config_json)
+    try:
+        if column_names:
+            columns = [c.strip() for c in column_names.split(",") if c.strip()]
+        else:
+            from core.db_connectors import get_inspector
+            inspector = get_inspector(engine)
+            columns = [c["name"] for c in inspector.get_columns(table_name, schema=schema_name)]
+
+        def _one(column: str) -> dict[str, Any]:
+            return json.loads(analyze_column_stats.func(
+                table_name, column, schema_name=schema_name, db_config_json=db_config_json,
+            ))
+
+        workers = max(1, min(MAX_PARALLEL_QUERIES, len(columns)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_one, columns))
+
+        return dump({
+            "table": table_name,
+            "columns": dict(zip(columns, results)),
+        })
+    except Exception as exc:
+        logger.error("analyze_table_column_stats failed: %s", exc)
+        return err(exc)
+
+
+# ---------------------------------------------------------------------------
+# Tool: analyze_table_profile
+# ---------------------------------------------------------------------------
+
+# Base type names (lower-case, size/precision stripped) that accept ::numeric.
+_NUMERIC_TYPE_NAMES = frozenset({
+    "tinyint", "smallint", "integer", "int", "bigint", "hugeint",
+    "utinyint", "usmallint", "uinteger", "ubigint", "uhugeint",
+    "int2", "int4", "int8", "decimal", "numeric", "real", "float",
+    "float4", "float8", "double", "double precision", "money",
+})
+
+
+def _is_numeric_type(type_: Any) -> bool:
+    return str(type_).lower().split("(", 1)[0].strip() in _NUMERIC_TYPE_NAMES
+
+
+@tool
+@_ttl_cached(TOOL_RESULT_TTL)
+def analyze_table_profile(
+    table_name: str,
+    column_names: str = "",
+    schema_name: str = "public",
+    db_config_json: str = "{}",
+) -> str:
+    """
+    Profile many columns of a table in a single scan: null count/rate,
+    distinct count, min and max for every column, plus mean and stddev
+    for numeric columns. Prefer this over per-column calls for bulk profiling.
+
+    Args:
+        table_name: Target table.
+        column_names: Comma-separated columns (if empty, uses all columns).
+        schema_name: Schema containing the table (default: 'public').
+        db_config_json: JSON string with optional db connection config.
+
+    Returns:
+        JSON with total_rows and a per-column map of profile statistics.
+    """
+    db_config = parse_db_config(db_config_json)
+    engine = _engine_cached(db_config_json)
+    sample = _sample_clause(engine, db_config)
+    from core.db_connectors import get_inspector
+    try:
+        all_cols = get_inspector(engine).get_columns(table_name, schema=schema_name)
+        if column_names:
+            wanted = [c.strip() for c in column_names.split(",") if c.strip()]
+            types = {c["name"]: c.get("type") for c in all_cols}
+            columns = [(c, _is_numeric_type(types.get(c))) for c in wanted]
+        else:
+            columns = [(c["name"], _is_numeric_type(c.get("type"))) for c in all_cols]
+
+        cached = _cached_profile(engine, schema_name, table_name, sample)
+        if cached is not None and all(name in cached["columns"] for name, _ in columns):
+            total_rows = cached["total_rows"]
+            distinct_approx = cached["distinct_count_approx"]
+            profile = {name: cached["columns"][name] for name, _ in columns}
+        else:
+            # Taken before the scan so writes landing mid-scan invalidate the entry
+            marker, started = _change_marker(engine, schema_name, table_name), time.monotonic()
+            tbl = _qualify(schema_name, table_name) + sample
+            distinct_tmpl, distinct_approx = _distinct_count_template(engine, schema_name, table_name)
+            # Six aggregates per numeric column; chunk so one statement stays under
+            # the target-list limit. Values are read back by position.
+            per_chunk = max(1, _MAX_SELECT_EXPRS // 6)
+            profile: dict[str, dict[str, Any]] = {}
+            total_rows = 0
+            with _connect(engine) as conn:
+                for start in range(0, len(columns), per_chunk):
+                    chunk = columns[start:start + per_chunk]
+                    exprs = ["COUNT(*)"]
+                    for name, numeric in chunk:
+                        col = _quote_ident(name)
+                        exprs += [
+                            f"COUNT({col})",
+                            distinct_tmpl.format(col=col),
+                            f"MIN({col}::text)",
+                            f"MAX({col}::text)",
+                        ]
+                        if numeric:
+                            exprs += [f"AVG({col}::numeric)", f"STDDEV({col}::numeric)"]
+                    row = iter(conn.execute(_sql(f"SELECT {', '.join(exprs)} FROM {tbl}")).fetchone())
+                    total_rows = next(row)
+                    for name, numeric in chunk:
+                        nonnull, distinct, min_value, max_value = (next(row) for _ in range(4))
+                        mean_value, std_dev = (next(row), next(row)) if numeric else (None, None)
+                        null_count = total_rows - nonnull
+                        profile[name] = {
+                            "null_count": null_count,
+                            "null_rate": round(null_count / total_rows, 4) if total_rows else 0.0,
+                            "distinct_count": min(distinct, nonnull),
+                            "min_value": min_value,
+                            "max_value": max_value,
+                            "mean_value": float(mean_value) if mean_value is not None else None,
+                            "std_dev": float(std_dev) if std_dev is not None else None,
+                        }
+            if not column_names:
+                with _profile_lock:
+                    _profile_cache[(id(engine), schema_name, table_name, sample)] = (marker, started, {
+                        "total_rows": total_rows,
+                        "distinct_count_approx": distinct_approx,
+                        "columns": profile,
+                    })
+
+        return dump({
+            "table": table_name,
+            "total_rows": total_rows,
+            "distinct_count_approx": distinct_approx,
+            "columns": profile,
+            **({"sample_pct": db_config["sample_pct"]} if sample else {}),
+        })
+    except Exception as exc:
+        logger.error("analyze_table_profile failed: %s", exc)
+        return err(exc)
 
 
 # ---------------------------------------------------------------------------
@@ -145,6 +722,7 @@ def analyze_column_stats(
 # ---------------------------------------------------------------------------
 
 @tool
+@_ttl_cached(TOOL_RESULT_TTL)
 def check_pk_uniqueness(
     table_name: str,
     pk_columns: str,
@@ -163,40 +741,35 @@ def check_pk_uniqueness(
     Returns:
         JSON with total_rows, unique_pk_rows, uniqueness_rate.
     """
-    db_config = json.loads(db_config_json)
-    engine = _engine(db_config)
+    db_config = parse_db_config(db_config_json)
+    engine = _engine_cached(db_config_json)
     cols = [c.strip() for c in pk_columns.split(",")]
-    col_expr = ", ".join(f'"{c}"' for c in cols)
     try:
-        q = text(
+        col_expr = ", ".join(_quote_ident(c) for c in cols)
+        tbl = _qualify(schema_name, table_name)
+        # Count surplus rows in duplicated keys instead of materializing every
+        # distinct key: singleton groups are dropped by HAVING, so on a healthy
+        # key only the (usually empty) duplicate set survives the aggregate.
+        q = _sql(
             f"""
             SELECT
-                COUNT(*) AS total_rows,
-                COUNT(*) OVER () - COUNT(*) AS duplicate_count,
-                (SELECT COUNT(*) FROM (
-                    SELECT {col_expr} FROM "{schema_name}"."{table_name}"
-                    GROUP BY {col_expr}
-                ) AS t) AS unique_pk_rows
-            FROM "{schema_name}"."{table_name}"
-            LIMIT 1
-            """
-        )
-        # Simpler alternative for all DB types
-        q2 = text(
-            f"""
-            SELECT
-                (SELECT COUNT(*) FROM "{schema_name}"."{table_name}") AS total_rows,
-                (SELECT COUNT(*) FROM (
-                    SELECT {col_expr} FROM "{schema_name}"."{table_name}"
-                    GROUP BY {col_expr}
-                ) AS sub) AS unique_pk_rows
+                (SELECT COUNT(*) FROM {tbl}) AS total_rows,
+                COALESCE((
+                    SELECT SUM(cnt) - COUNT(*)
+                    FROM (
+                        SELECT COUNT(*) AS cnt
+                        FROM {tbl}
+                        GROUP BY {col_expr}
+                        HAVING COUNT(*) > 1
+                    ) AS dup
+                ), 0) AS duplicate_rows
             """
         )
-        with engine.connect() as conn:
-            row = conn.execute(q2).mappings().one()
+        with _connect(engine) as conn:
+            row = conn.execute(q).mappings().one()
         total = row["total_rows"] or 1
-        unique = row["unique_pk_rows"]
-        return json.dumps({
+        unique = row["total_rows"] - int(row["duplicate_rows"])
+        return dump({
             "table": table_name,
             "pk_columns": cols,
             "total_rows": total,
@@ -205,7 +778,7 @@ def check_pk_uniqueness(
         })
     except Exception as exc:
         logger.error("check_pk_uniqueness failed: %s", exc)
-        return json.dumps({"error": str(exc)})
+        return err(exc)
 
 
 # ---------------------------------------------------------------------------
@@ -213,6 +786,7 @@ def check_pk_uniqueness(
 # ---------------------------------------------------------------------------
 
 @tool
+@_ttl_cached(FRESHNESS_RESULT_TTL)
 def check_freshness(
     table_name: str,
     timestamp_column: str,
@@ -230,22 +804,51 @@ def check_freshness(
 
     Returns:
         JSON with latest_record, oldest_record, age_days.
+
+    When an index (or the primary key) leads with timestamp_column, the two
+    ends are read with ORDER BY ... LIMIT 1 probes; otherwise one MIN/MAX
+    aggregate scans the table, unless db_config sets require_index.
     """
-    db_config = json.loads(db_config_json)
-    engine = _engine(db_config)
+    db_config = parse_db_config(db_config_json)
+    engine = _engine_cached(db_config_json)
     try:
-        q = text(
-            f"""
-            SELECT
-                MAX("{timestamp_column}") AS latest_record,
-                MIN("{timestamp_column}") AS oldest_record,
-                EXTRACT(EPOCH FROM (NOW() - MAX("{timestamp_column}"))) / 86400 AS age_days
-            FROM "{schema_name}"."{table_name}"
-            """
-        )
-        with engine.connect() as conn:
+        col, tbl = _quote_ident(timestamp_column), _qualify(schema_name, table_name)
+        if _has_leading_index(engine, table_name, timestamp_column, schema_name):
+            # Each probe walks one end of the btree instead of scanning the table.
+            # Both share one round trip: each finishes in microseconds, so
+            # running them on two pooled connections would only add overhead.
+            q = _sql(
+                f"""
+                SELECT
+                    latest_record,
+                    oldest_record,
+                    EXTRACT(EPOCH FROM (NOW() - latest_record)) / 86400 AS age_days
+                FROM (
+                    SELECT
+                        (SELECT {col} FROM {tbl} WHERE {col} IS NOT NULL
+                         ORDER BY {col} DESC LIMIT 1) AS latest_record,
+                        (SELECT {col} FROM {tbl} WHERE {col} IS NOT NULL
+                         ORDER BY {col} ASC LIMIT 1) AS oldest_record
+                ) AS probe
+                """
+            )
+        elif db_config.get("require_index"):
+            return err(f"No index leads with {timestamp_column!r}; full scan skipped (require_index).")
+        else:
+            # Without an index Postgres can't turn MIN/MAX into probes; one
+            # aggregate keeps it to a single scan for both ends.
+            q = _sql(
+                f"""
+                SELECT
+                    MAX({col}) AS latest_record,
+                    MIN({col}) AS oldest_record,
+                    EXTRACT(EPOCH FROM (NOW() - MAX({col}))) / 86400 AS age_days
+                FROM {tbl}
+                """
+            )
+        with _connect(engine) as conn:
             row = conn.execute(q).mappings().one()
-        return json.dumps({
+        return dump({
             "table": table_name,
             "timestamp_column": timestamp_column,
             "latest_record": str(row["latest_record"]) if row["latest_record"] else None,
@@ -254,7 +857,7 @@ def check_freshness(
         })
     except Exception as exc:
         logger.error("check_freshness failed: %s", exc)
-        return json.dumps({"error": str(exc)})
+        return err(exc)
 
 
 # ---------------------------------------------------------------------------
@@ -266,56 +869,75 @@ def compute_table_completeness(
     table_name: str,
     schema_name: str = "public",
     db_config_json: str = "{}",
+    force_refresh: bool = False,
 ) -> str:
     """
     Compute overall table completeness: average non-null rate across all columns.
+    Results are cached in-process and reused until the table is written to
+    (Postgres), or for at most the tool result TTL where the engine keeps no
+    write counter.
 
     Args:
         table_name: Target table.
         schema_name: Schema containing the table (default: 'public').
         db_config_json: JSON string with optional db connection config.
+        force_refresh: Recompute even if a cached result is available.
 
     Returns:
         JSON with overall_completeness (0.0–1.0) and per-column null rates.
     """
-    db_config = json.loads(db_config_json)
-    engine = _engine(db_config)
+    db_config = parse_db_config(db_config_json)
+    engine = _engine_cached(db_config_json)
     from core.db_connectors import get_inspector
     inspector = get_inspector(engine)
     try:
+        sample = _sample_clause(engine, db_config)
+        key = (id(engine), schema_name, table_name, sample)
+        # Taken before the scan so writes landing mid-scan invalidate the entry
+        marker, started = _change_marker(engine, schema_name, table_name), time.monotonic()
+        if not force_refresh:
+            with _completeness_lock:
+                cached = _completeness_cache.get(key)
+            if _entry_fresh(cached, marker):
+                return cached[2]
+
         columns = [c["name"] for c in inspector.get_columns(table_name, schema=schema_name)]
-        null_rate_exprs = ",\n".join(
-            f'AVG(CASE WHEN "{c}" IS NULL THEN 1.0 ELSE 0.0 END) AS "{c}_null_rate"'
-            for c in columns
-        )
-        q = text(
+        tbl = _qualify(schema_name, table_name) + sample
+        # COUNT(col) skips NULLs natively (int8 counter, no NUMERIC AVG);
+        # results are read by position so long column names can't collide
+        # after identifier truncation.
+        nonnull_exprs = ",\n".join(f'COUNT({_quote_ident(c)})' for c in columns)
+        q = _sql(
             f"""
             SELECT
-                COUNT(*) AS total_rows,
-                {null_rate_exprs}
-            FROM "{schema_name}"."{table_name}"
+                COUNT(*) AS total_rows{"," if columns else ""}
+                {nonnull_exprs}
+            FROM {tbl}
             """
         )
-        with engine.connect() as conn:
-            row = dict(conn.execute(q).mappings().one())
+        with _connect(engine) as conn:
+            row = tuple(conn.execute(q).fetchone())
 
+        total_rows = row[0]
         per_col_null_rates: dict[str, float] = {}
-        for c in columns:
-            key = f"{c}_null_rate"
-            val = row.get(key)
-            per_col_null_rates[c] = round(float(val), 4) if val is not None else 0.0
+        for c, nonnull in zip(columns, row[1:]):
+            per_col_null_rates[c] = round((total_rows - nonnull) / total_rows, 4) if total_rows else 0.0
 
         overall = 1.0 - (sum(per_col_null_rates.values()) / len(per_col_null_rates)) if per_col_null_rates else 1.0
 
-        return json.dumps({
+        result = dump({
             "table": table_name,
-            "total_rows": row.get("total_rows"),
+            "total_rows": total_rows,
             "overall_completeness": round(overall, 4),
             "column_null_rates": per_col_null_rates,
+            **({"sample_pct": db_config["sample_pct"]} if sample else {}),
         })
+        with _completeness_lock:
+            _completeness_cache[key] = (marker, started, result)
+        return result
     except Exception as exc:
         logger.error("compute_table_completeness failed: %s", exc)
-        return json.dumps({"error": str(exc)})
+        return err(exc)
 
 
 # ---------------------------------------------------------------------------
@@ -323,6 +945,7 @@ def compute_table_completeness(
 # ---------------------------------------------------------------------------
 
 @tool
+@_ttl_cached(TOOL_RESULT_TTL)
 def detect_outliers_zscore(
     table_name: str,
     column_name: str,
@@ -343,61 +966,64 @@ def detect_outliers_zscore(
     Returns:
         JSON with outlier_count, outlier_percentage, mean, stddev, and sample outliers.
     """
-    db_config = json.loads(db_config_json)
-    engine = _engine(db_config)
+    db_config = parse_db_config(db_config_json)
+    engine = _engine_cached(db_config_json)
+    sample = _sample_clause(engine, db_config)
     try:
-        # Calculate mean and stddev
-        q_stats = text(f"""
-            SELECT 
-                AVG("{column_name}"::numeric) AS mean_val,
-                STDDEV("{column_name}"::numeric) AS stddev_val,
-                COUNT(*) AS total_rows
-            FROM "{schema_name}"."{table_name}"
-            WHERE "{column_name}" IS NOT NULL
+        col, tbl = _quote_ident(column_name), _qualify(schema_name, table_name)
+        # Stats, outlier count and the top-5 sample in one statement: v reads
+        # and casts the column once (Postgres materializes it, being used
+        # twice), s yields mean/stddev, then a single aggregate over the
+        # z-scores counts and collects the outliers.
+        q = _sql(f"""
+            WITH v AS (
+                SELECT {col}::numeric AS value
+                FROM {tbl}{sample}
+                WHERE {col} IS NOT NULL
+            ), s AS (
+                SELECT
+                    AVG(value) AS mean_val,
+                    STDDEV(value) AS stddev_val,
+                    COUNT(*) AS total_rows
+                FROM v
+            ), z AS (
+                SELECT v.value,
+                       ABS((v.value - s.mean_val) / NULLIF(s.stddev_val, 0)) AS zscore
+                FROM v CROSS JOIN s
+            )
+            SELECT
+                s.mean_val,
+                s.stddev_val,
+                s.total_rows,
+                COUNT(z.value) FILTER (WHERE z.zscore > :threshold) AS outlier_count,
+                (ARRAY_AGG(z.value ORDER BY z.zscore DESC)
+                    FILTER (WHERE z.zscore > :threshold))[1:5] AS sample_values
+            FROM s LEFT JOIN z ON TRUE
+            GROUP BY s.mean_val, s.stddev_val, s.total_rows
         """)
-        with engine.connect() as conn:
-            stats = conn.execute(q_stats).mappings().one()
-        
-        mean_val = float(stats["mean_val"]) if stats["mean_val"] else 0
-        stddev_val = float(stats["stddev_val"]) if stats["stddev_val"] else 0
-        total_rows = stats["total_rows"] or 1
-        
+        with _connect(engine) as conn:
+            row = conn.execute(q, {"threshold": threshold}).mappings().one()
+
+        mean_val = float(row["mean_val"]) if row["mean_val"] else 0
+        stddev_val = float(row["stddev_val"]) if row["stddev_val"] else 0
+        total_rows = row["total_rows"] or 1
+
         if stddev_val == 0:
-            return json.dumps({
+            return dump({
                 "table": table_name,
                 "column": column_name,
                 "error": "Standard deviation is zero - no variation in data",
                 "outlier_count": 0,
                 "outlier_percentage": 0
             })
-        
-        # Count outliers using Z-score
-        q_outliers = text(f"""
-            SELECT COUNT(*) AS outlier_count
-            FROM "{schema_name}"."{table_name}"
-            WHERE "{column_name}" IS NOT NULL
-            AND ABS(("{column_name}"::numeric - {mean_val}) / {stddev_val}) > {threshold}
-        """)
-        with engine.connect() as conn:
-            outlier_row = conn.execute(q_outliers).mappings().one()
-        
-        outlier_count = outlier_row["outlier_count"] or 0
-        
-        # Get sample outlier values
-        q_sample = text(f"""
-            SELECT "{column_name}" AS value,
-                   ABS(("{column_name}"::numeric - {mean_val}) / {stddev_val}) AS zscore
-            FROM "{schema_name}"."{table_name}"
-            WHERE "{column_name}" IS NOT NULL
-            AND ABS(("{column_name}"::numeric - {mean_val}) / {stddev_val}) > {threshold}
-            ORDER BY zscore DESC
-            LIMIT 5
-        """)
-        with engine.connect() as conn:
-            sample_outliers = [{"value": float(r["value"]), "zscore": round(float(r["zscore"]), 2)} 
-                              for r in conn.execute(q_sample).mappings().all()]
-        
-        return json.dumps({
+
+        outlier_count = row["outlier_count"] or 0
+        sample_outliers = [
+            {"value": float(v), "zscore": round(abs((float(v) - mean_val) / stddev_val), 2)}
+            for v in row["sample_values"] or []
+        ]
+
+        return dump({
             "table": table_name,
             "column": column_name,
             "method": "z-score",
@@ -407,11 +1033,12 @@ def detect_outliers_zscore(
             "total_rows": total_rows,
             "outlier_count": outlier_count,
             "outlier_percentage": round(outlier_count / total_rows * 100, 2),
-            "sample_outliers": sample_outliers
+            "sample_outliers": sample_outliers,
+            **({"sample_pct": db_config["sample_pct"]} if sample else {}),
         })
     except Exception as exc:
         logger.error("detect_outliers_zscore failed: %s", exc)
-        return json.dumps({"error": str(exc)})
+        return err(exc)
 
 
 # ---------------------------------------------------------------------------
@@ -419,6 +1046,7 @@ def detect_outliers_zscore(
 # ---------------------------------------------------------------------------
 
 @tool
+@_ttl_cached(TOOL_RESULT_TTL)
 def detect_outliers_iqr(
     table_name: str,
     column_name: str,
@@ -440,49 +1068,55 @@ def detect_outliers_iqr(
     Returns:
         JSON with Q1, Q3, IQR, outlier bounds, and outlier count.
     """
-    db_config = json.loads(db_config_json)
-    engine = _engine(db_config)
+    db_config = parse_db_config(db_config_json)
+    engine = _engine_cached(db_config_json)
+    # Row-level sampling: page samples skew quartiles on clustered tables
+    sample = _sample_clause(engine, db_config, method="BERNOULLI")
     try:
-        q = text(f"""
+        col, tbl = _quote_ident(column_name), _qualify(schema_name, table_name) + sample
+        # multiplier and the fences are bound, not spliced in, so the SQL text
+        # depends only on the identifiers and repeat calls reuse the cached plan.
+        q = _sql(f"""
             WITH stats AS (
                 SELECT 
-                    PERCENTILE_CONT(0.25) WITHIN GROUP (ORDER BY "{column_name}"::numeric) AS q1,
-                    PERCENTILE_CONT(0.75) WITHIN GROUP (ORDER BY "{column_name}"::numeric) AS q3,
+                    PERCENTILE_CONT(0.25) WITHIN GROUP (ORDER BY {col}::numeric) AS q1,
+                    PERCENTILE_CONT(0.75) WITHIN GROUP (ORDER BY {col}::numeric) AS q3,
                     COUNT(*) AS total_rows
-                FROM "{schema_name}"."{table_name}"
-                WHERE "{column_name}" IS NOT NULL
+                FROM {tbl}
+                WHERE {col} IS NOT NULL
             )
             SELECT 
                 q1, q3,
                 q3 - q1 AS iqr,
-                q1 - {multiplier} * (q3 - q1) AS lower_bound,
-                q3 + {multiplier} * (q3 - q1) AS upper_bound,
+                q1 - :multiplier * (q3 - q1) AS lower_bound,
+                q3 + :multiplier * (q3 - q1) AS upper_bound,
                 total_rows
             FROM stats
         """)
-        with engine.connect() as conn:
-            row = conn.execute(q).mappings().one()
-        
-        q1 = float(row["q1"]) if row["q1"] else 0
-        q3 = float(row["q3"]) if row["q3"] else 0
-        iqr = float(row["iqr"]) if row["iqr"] else 0
-        lower_bound = float(row["lower_bound"]) if row["lower_bound"] else 0
-        upper_bound = float(row["upper_bound"]) if row["upper_bound"] else 0
-        total_rows = row["total_rows"] or 1
-        
-        # Count outliers
-        q_count = text(f"""
+        q_count = _sql(f"""
             SELECT COUNT(*) AS outlier_count
-            FROM "{schema_name}"."{table_name}"
-            WHERE "{column_name}" IS NOT NULL
-            AND ("{column_name}"::numeric < {lower_bound} OR "{column_name}"::numeric > {upper_bound})
+            FROM {tbl}
+            WHERE {col} IS NOT NULL
+            AND ({col}::numeric < :lower_bound OR {col}::numeric > :upper_bound)
         """)
-        with engine.connect() as conn:
-            outlier_row = conn.execute(q_count).mappings().one()
-        
+        # Both statements run on one checked-out connection
+        with _connect(engine) as conn:
+            row = conn.execute(q, {"multiplier": multiplier}).mappings().one()
+
+            q1 = float(row["q1"]) if row["q1"] else 0
+            q3 = float(row["q3"]) if row["q3"] else 0
+            iqr = float(row["iqr"]) if row["iqr"] else 0
+            lower_bound = float(row["lower_bound"]) if row["lower_bound"] else 0
+            upper_bound = float(row["upper_bound"]) if row["upper_bound"] else 0
+            total_rows = row["total_rows"] or 1
+
+            outlier_row = conn.execute(
+                q_count, {"lower_bound": lower_bound, "upper_bound": upper_bound}
+            ).mappings().one()
+
         outlier_count = outlier_row["outlier_count"] or 0
         
-        return json.dumps({
+        return dump({
             "table": table_name,
             "column": column_name,
             "method": "iqr",
@@ -494,11 +1128,12 @@ def detect_outliers_iqr(
             "upper_bound": round(upper_bound, 4),
             "total_rows": total_rows,
             "outlier_count": outlier_count,
-            "outlier_percentage": round(outlier_count / total_rows * 100, 2)
+            "outlier_percentage": round(outlier_count / total_rows * 100, 2),
+            **({"sample_pct": db_config["sample_pct"]} if sample else {}),
         })
     except Exception as exc:
         logger.error("detect_outliers_iqr failed: %s", exc)
-        return json.dumps({"error": str(exc)})
+        return err(exc)
 
 
 # ---------------------------------------------------------------------------
@@ -506,6 +1141,7 @@ def detect_outliers_iqr(
 # ---------------------------------------------------------------------------
 
 @tool
+@_ttl_cached(TOOL_RESULT_TTL)
 def compute_distribution_stats(
     table_name: str,
     column_name: str,
@@ -524,27 +1160,38 @@ def compute_distribution_stats(
     Returns:
         JSON with mean, median, mode, skewness, kurtosis, and percentile distribution.
     """
-    db_config = json.loads(db_config_json)
-    engine = _engine(db_config)
+    db_config = parse_db_config(db_config_json)
+    engine = _engine_cached(db_config_json)
+    # Row-level sampling: page samples skew percentiles on clustered tables
+    sample = _sample_clause(engine, db_config, method="BERNOULLI")
     try:
-        # Get basic stats and percentiles
-        q = text(f"""
+        # Get basic stats and percentiles. The column is cast once per row in
+        # the derived table; every aggregate then reads the ready value v.
+        col, tbl = _quote_ident(column_name), _qualify(schema_name, table_name) + sample
+        q = _sql(f"""
             SELECT 
                 COUNT(*) AS total_rows,
-                AVG("{column_name}"::numeric) AS mean_val,
-                STDDEV("{column_name}"::numeric) AS stddev_val,
-                VARIANCE("{column_name}"::numeric) AS variance_val,
-                PERCENTILE_CONT(0.5) WITHIN GROUP (ORDER BY "{column_name}"::numeric) AS median,
-                PERCENTILE_CONT(0.1) WITHIN GROUP (ORDER BY "{column_name}"::numeric) AS p10,
-                PERCENTILE_CONT(0.25) WITHIN GROUP (ORDER BY "{column_name}"::numeric) AS p25,
-                PERCENTILE_CONT(0.75) WITHIN GROUP (ORDER BY "{column_name}"::numeric) AS p75,
-                PERCENTILE_CONT(0.9) WITHIN GROUP (ORDER BY "{column_name}"::numeric) AS p90,
-                MIN("{column_name}"::numeric) AS min_val,
-                MAX("{column_name}"::numeric) AS max_val
-            FROM "{schema_name}"."{table_name}"
-            WHERE "{column_name}" IS NOT NULL
+                AVG(v) AS mean_val,
+                STDDEV(v) AS stddev_val,
+                VARIANCE(v) AS variance_val,
+                PERCENTILE_CONT(0.5) WITHIN GROUP (ORDER BY v) AS median,
+                PERCENTILE_CONT(0.1) WITHIN GROUP (ORDER BY v) AS p10,
+                PERCENTILE_CONT(0.25) WITHIN GROUP (ORDER BY v) AS p25,
+                PERCENTILE_CONT(0.75) WITHIN GROUP (ORDER BY v) AS p75,
+                PERCENTILE_CONT(0.9) WITHIN GROUP (ORDER BY v) AS p90,
+                MIN(v) AS min_val,
+                MAX(v) AS max_val,
+                SUM(v) AS s1,
+                SUM(POWER(v, 2)) AS s2,
+                SUM(POWER(v, 3)) AS s3,
+                SUM(POWER(v, 4)) AS s4
+            FROM (
+                SELECT {col}::numeric AS v
+                FROM {tbl}
+                WHERE {col} IS NOT NULL
+            ) AS d
         """)
-        with engine.connect() as conn:
+        with _connect(engine) as conn:
             row = conn.execute(q).mappings().one()
         
         mean_val = float(row["mean_val"]) if row["mean_val"] else 0
@@ -555,22 +1202,12 @@ def compute_distribution_stats(
         max_val = float(row["max_val"]) if row["max_val"] else 0
         total_rows = row["total_rows"] or 1
         
-        # Calculate skewness and kurtosis using DuckDB/Postgres
-        # Skewness = E[(X-μ)³] / σ³
-        # Kurtosis = E[(X-μ)⁴] / σ⁴ - 3
-        q_skew = text(f"""
-            SELECT 
-                AVG(("{column_name}"::numeric - {mean_val})^3) / NULLIF({stddev_val}^3, 0) AS skewness,
-                AVG(("{column_name}"::numeric - {mean_val})^4) / NULLIF({stddev_val}^4, 0) - 3 AS kurtosis
-            FROM "{schema_name}"."{table_name}"
-            WHERE "{column_name}" IS NOT NULL
-        """)
-        with engine.connect() as conn:
-            skew_row = conn.execute(q_skew).mappings().one()
-        
-        skewness = float(skew_row["skewness"]) if skew_row["skewness"] else 0
-        kurtosis = float(skew_row["kurtosis"]) if skew_row["kurtosis"] else 0
-        
+        # Skewness = E[(X-μ)³] / σ³, Kurtosis = E[(X-μ)⁴] / σ⁴ - 3, with the
+        # central moments expanded from the raw power sums of the same scan.
+        m3, m4 = _central_moments(row["total_rows"], row["s1"], row["s2"], row["s3"], row["s4"])
+        skewness = m3 / stddev_val ** 3 if stddev_val else 0
+        kurtosis = m4 / stddev_val ** 4 - 3 if stddev_val else 0
+
         # Interpret skewness
         skew_interpretation = "symmetric" if abs(skewness) < 0.5 else \
                              "moderately skewed" if abs(skewness) < 1 else "highly skewed"
@@ -580,7 +1217,7 @@ def compute_distribution_stats(
         kurtosis_interpretation = "mesokurtic (normal)" if abs(kurtosis) < 1 else \
                                   "leptokurtic (heavy tails)" if kurtosis > 1 else "platykurtic (light tails)"
         
-        return json.dumps({
+        return dump({
             "table": table_name,
             "column": column_name,
             "total_rows": total_rows,
@@ -601,18 +1238,26 @@ def compute_distribution_stats(
                 "p50": round(median, 4),
                 "p75": round(float(row["p75"]), 4) if row["p75"] else None,
                 "p90": round(float(row["p90"]), 4) if row["p90"] else None
-            }
+            },
+            **({"sample_pct": db_config["sample_pct"]} if sample else {}),
         })
     except Exception as exc:
         logger.error("compute_distribution_stats failed: %s", exc)
-        return json.dumps({"error": str(exc)})
+        return err(exc)
 
 
 # ---------------------------------------------------------------------------
 # Tool: benford_law_analysis
 # ---------------------------------------------------------------------------
 
+# Benford's Law expected leading-digit frequencies, in digit order
+_BENFORD_EXPECTED = (
+    (1, 0.301), (2, 0.176), (3, 0.125), (4, 0.097), (5, 0.079),
+    (6, 0.067), (7, 0.058), (8, 0.051), (9, 0.046),
+)
+
 @tool
+@_ttl_cached(TOOL_RESULT_TTL)
 def benford_law_analysis(
     table_name: str,
     column_name: str,
@@ -633,58 +1278,47 @@ def benford_law_analysis(
     Returns:
         JSON with observed vs expected digit frequencies and fraud risk assessment.
     """
-    db_config = json.loads(db_config_json)
-    engine = _engine(db_config)
-    
-    # Benford's Law expected frequencies
-    benford_expected = {
-        1: 0.301, 2: 0.176, 3: 0.125, 4: 0.097, 5: 0.079,
-        6: 0.067, 7: 0.058, 8: 0.051, 9: 0.046
-    }
+    db_config = parse_db_config(db_config_json)
+    engine = _engine_cached(db_config_json)
     
     try:
-        # Extract leading digits
-        q = text(f"""
+        # Extract leading digits. The value is cast once; numeric text never
+        # uses exponent notation, so a finite v >= 1 starts with a digit 1-9.
+        # Postgres 'NaN' and 'Infinity' also pass v >= 1 but render as text,
+        # so the leading character is still checked before the int cast.
+        col, tbl = _quote_ident(column_name), _qualify(schema_name, table_name)
+        q = _sql(f"""
             SELECT 
-                LEFT(ABS("{column_name}"::numeric)::text, 1)::int AS leading_digit,
+                LEFT(v::text, 1)::int AS leading_digit,
                 COUNT(*) AS count
-            FROM "{schema_name}"."{table_name}"
-            WHERE "{column_name}" IS NOT NULL
-            AND "{column_name}"::numeric > 0
-            AND LEFT(ABS("{column_name}"::numeric)::text, 1) ~ '^[1-9]$'
+            FROM (SELECT {col}::numeric AS v FROM {tbl}) AS d
+            WHERE v >= 1 AND LEFT(v::text, 1) BETWEEN '1' AND '9'
             GROUP BY 1
             ORDER BY 1
         """)
-        with engine.connect() as conn:
+        with _connect(engine) as conn:
             rows = conn.execute(q).mappings().all()
         
         total_count = sum(r["count"] for r in rows)
         if total_count == 0:
-            return json.dumps({"error": "No valid positive numeric values found"})
+            return err("No valid positive numeric values found")
         
+        # One pass over digits 1-9; digits absent from the result count as 0
+        # and still contribute their expected share to chi-square.
+        counts = {r["leading_digit"]: r["count"] for r in rows}
         observed = {}
         chi_square = 0.0
-        
-        for r in rows:
-            digit = r["leading_digit"]
-            observed_count = r["count"]
+        for digit, expected_pct in _BENFORD_EXPECTED:
+            observed_count = counts.get(digit, 0)
             observed_pct = observed_count / total_count
-            expected_pct = benford_expected.get(digit, 0)
+            expected_count = expected_pct * total_count
+            chi_square += (observed_count - expected_count) ** 2 / expected_count
             observed[digit] = {
                 "count": observed_count,
                 "observed_pct": round(observed_pct * 100, 2),
                 "expected_pct": round(expected_pct * 100, 2),
                 "deviation": round((observed_pct - expected_pct) * 100, 2)
             }
-            # Chi-square contribution
-            expected_count = expected_pct * total_count
-            if expected_count > 0:
-                chi_square += ((observed_count - expected_count) ** 2) / expected_count
-        
-        # Fill missing digits
-        for d in range(1, 10):
-            if d not in observed:
-                observed[d] = {"count": 0, "observed_pct": 0, "expected_pct": round(benford_expected[d] * 100, 2), "deviation": round(-benford_expected[d] * 100, 2)}
         
         # Risk assessment based on chi-square
         # Critical values for df=8: 15.5 (p=0.05), 20.1 (p=0.01), 26.1 (p=0.001)
@@ -698,7 +1332,7 @@ def benford_law_analysis(
             risk_level = "high"
             risk_message = "Significant deviation from Benford's Law - potential fraud or data manipulation"
         
-        return json.dumps({
+        return dump({
             "table": table_name,
             "column": column_name,
             "total_values_analyzed": total_count,
@@ -709,7 +1343,65 @@ def benford_law_analysis(
         })
     except Exception as exc:
         logger.error("benford_law_analysis failed: %s", exc)
-        return json.dumps({"error": str(exc)})
+        return err(exc)
+
+
+# Rows per fetch when a correlation scan is streamed to the client.
+_CORR_STREAM_BATCH = 50_000
+
+
+def _streamed_pearson(engine, conn, statement: str, k: int) -> list[float | None]:
+    """
+    Pearson correlations from one streamed scan of statement's k float columns.
+
+    Pairwise sums are accumulated per batch with matrix products, so each
+    pair only counts rows where both values are present, as CORR() does.
+    Values are shifted by the first batch's column means to keep the
+    one-pass sums from cancelling. Returns the upper triangle row by row,
+    i.e. pairs (0, 1), (0, 2), ..., (k-2, k-1); undefined correlations are None.
+    """
+    import numpy as np
+
+    if engine.dialect.name == "duckdb":
+        from core.db_connectors import get_duckdb_conn
+        cur = get_duckdb_conn(engine, fresh=True)
+        cur.execute(statement)
+        fetch, close = cur.fetchmany, cur.close
+    else:
+        result = conn.execute(_sql(statement), execution_options={"stream_results": True})
+        fetch, close = result.fetchmany, result.close
+
+    n = np.zeros((k, k))
+    sx = np.zeros((k, k))
+    sxx = np.zeros((k, k))
+    sxy = np.zeros((k, k))
+    shift = None
+    try:
+        while batch := fetch(_CORR_STREAM_BATCH):
+            arr = np.array(batch, dtype=np.float64)  # NULL -> nan
+            present = ~np.isnan(arr)
+            if shift is None:
+                counts = present.sum(axis=0)
+                shift = np.where(present, arr, 0.0).sum(axis=0) / np.maximum(counts, 1)
+            # Per-batch products run in float32 (half the bytes through the
+            # GEMMs); the centred values keep them well inside its precision,
+            # and the running totals stay float64.
+            m = present.astype(np.float32)
+            x = np.where(present, arr - shift, 0.0).astype(np.float32)
+            n += m.T @ m
+            sx += x.T @ m
+            sxx += (x * x).T @ m
+            sxy += x.T @ x
+    finally:
+        close()
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        num = n * sxy - sx * sx.T
+        den = np.sqrt((n * sxx - sx ** 2) * (n * sxx.T - sx.T ** 2))
+        corr = np.where((n > 1) & (den > 0), num / den, np.nan)
+    # Only the k(k-1)/2 upper-triangle cells leave numpy, masked in one pass
+    upper = corr[np.triu_indices(k, k=1)]
+    return np.where(np.isnan(upper), None, upper).tolist()
 
 
 # ---------------------------------------------------------------------------
@@ -717,6 +1409,7 @@ def benford_law_analysis(
 # ---------------------------------------------------------------------------
 
 @tool
+@_ttl_cached(TOOL_RESULT_TTL)
 def compute_correlation_matrix(
     table_name: str,
     schema_name: str = "public",
@@ -735,8 +1428,8 @@ def compute_correlation_matrix(
     Returns:
         JSON with correlation matrix and significant correlations identified.
     """
-    db_config = json.loads(db_config_json)
-    engine = _engine(db_config)
+    db_config = parse_db_config(db_config_json)
+    engine = _engine_cached(db_config_json)
     
     try:
         from core.db_connectors import get_inspector
@@ -747,60 +1440,59 @@ def compute_correlation_matrix(
             numeric_cols = [c.strip() for c in columns.split(",")]
         else:
             all_cols = inspector.get_columns(table_name, schema=schema_name)
-            numeric_types = {'integer', 'bigint', 'smallint', 'decimal', 'numeric', 'real', 'double precision', 'float', 'money'}
-            numeric_cols = [c["name"] for c in all_cols if str(c.get("type", "")).lower() in numeric_types or 
-                           any(t in str(c.get("type", "")).lower() for t in numeric_types)]
+            numeric_cols = [c["name"] for c in all_cols if _is_numeric_type(c.get("type"))]
         
         if len(numeric_cols) < 2:
-            return json.dumps({"error": "Need at least 2 numeric columns for correlation"})
-        
-        # Build correlation query
-        corr_pairs = []
-        matrix = {}
-        
-        for i, col1 in enumerate(numeric_cols):
-            matrix[col1] = {}
-            for j, col2 in enumerate(numeric_cols):
-                if i == j:
-                    matrix[col1][col2] = 1.0
-                elif j > i:
-                    q = text(f"""
-                        SELECT CORR("{col1}"::numeric, "{col2}"::numeric) AS correlation
-                        FROM "{schema_name}"."{table_name}"
-                        WHERE "{col1}" IS NOT NULL AND "{col2}" IS NOT NULL
-                    """)
-                    with engine.connect() as conn:
-                        row = conn.execute(q).mappings().one()
-                    corr = float(row["correlation"]) if row["correlation"] else 0
-                    matrix[col1][col2] = round(corr, 4)
-                    matrix[col2] = matrix.get(col2, {})
-                    matrix[col2][col1] = round(corr, 4)
-                    
-                    # Track significant correlations
-                    if abs(corr) > 0.7:
-                        corr_pairs.append({
-                            "column_1": col1,
-                            "column_2": col2,
-                            "correlation": round(corr, 4),
-                            "strength": "strong positive" if corr > 0.7 else "strong negative"
-                        })
-                    elif abs(corr) > 0.5:
-                        corr_pairs.append({
-                            "column_1": col1,
-                            "column_2": col2,
-                            "correlation": round(corr, 4),
-                            "strength": "moderate positive" if corr > 0.5 else "moderate negative"
-                        })
+            return err("Need at least 2 numeric columns for correlation")
         
-        return json.dumps({
+        # Every pair's CORR in one scan; aggregates skip rows where either side
+        # is NULL, matching the old per-pair WHERE ... IS NOT NULL filter.
+        # Past Postgres's 1664-column target list the pairs would need several
+        # scans, so wide column sets stream the rows once and correlate locally.
+        sample = _sample_clause(engine, db_config)
+        tbl = _qualify(schema_name, table_name) + sample
+        quoted = [_quote_ident(c) for c in numeric_cols]
+        pairs = [(i, j) for i in range(len(numeric_cols)) for j in range(i + 1, len(numeric_cols))]
+        with _connect(engine) as conn:
+            if len(pairs) <= _MAX_SELECT_EXPRS:
+                exprs = ", ".join(f"CORR({quoted[i]}::numeric, {quoted[j]}::numeric)" for i, j in pairs)
+                values = list(conn.execute(_sql(f"SELECT {exprs} FROM {tbl}")).fetchone())
+            else:
+                casts = ", ".join(f"CAST({c} AS DOUBLE PRECISION)" for c in quoted)
+                values = _streamed_pearson(engine, conn, f"SELECT {casts} FROM {tbl}", len(quoted))
+
+        # One pass over the upper triangle fills both matrix cells and picks
+        # out significant pairs; each value is converted and rounded once.
+        corr_pairs: list[tuple[float, dict[str, Any]]] = []
+        matrix: dict[str, dict[str, float]] = {c: {c: 1.0} for c in numeric_cols}
+        for (i, j), value in zip(pairs, values):
+            col1, col2 = numeric_cols[i], numeric_cols[j]
+            corr = float(value) if value else 0
+            rounded = round(corr, 4)
+            matrix[col1][col2] = matrix[col2][col1] = rounded
+
+            # Track significant correlations
+            magnitude = abs(corr)
+            if magnitude > 0.5:
+                tier = "strong" if magnitude > 0.7 else "moderate"
+                corr_pairs.append((abs(rounded), {
+                    "column_1": col1,
+                    "column_2": col2,
+                    "correlation": rounded,
+                    "strength": f"{tier} {'positive' if corr > 0 else 'negative'}"
+                }))
+        corr_pairs.sort(key=lambda p: p[0], reverse=True)
+
+        return dump({
             "table": table_name,
             "columns_analyzed": numeric_cols,
             "correlation_matrix": matrix,
-            "significant_correlations": sorted(corr_pairs, key=lambda x: abs(x["correlation"]), reverse=True)
+            "significant_correlations": [pair for _, pair in corr_pairs],
+            **({"sample_pct": db_config["sample_pct"]} if sample else {}),
         })
     except Exception as exc:
         logger.error("compute_correlation_matrix failed: %s", exc)
-        return json.dumps({"error": str(exc)})
+        return err(exc)
 
 
 # ---------------------------------------------------------------------------
@@ -810,6 +1502,8 @@ def compute_correlation_matrix(
 QUALITY_TOOLS = [
     analyze_column_nulls,
     analyze_column_stats,
+    analyze_table_column_stats,
+    analyze_table_profile,
     check_pk_uniqueness,
     check_freshness,
     compute_table_completeness,
@@ -6,11 +6,24 @@ from __future__ import annotations
 
 import json
 import logging
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
 from langchain_core.tools import tool
-
-from core.db_connectors import DuckDBEngine, get_engine, get_inspector, list_schemas
+from sqlalchemy import text
+
+from core.db_connectors import (
+    DuckDBEngine,
+    estimate_row_count,
+    get_engine,
+    get_inspector,
+    list_schemas,
+    parse_db_config,
+    quote_table,
+)
+from tools._envelope import dump
 
 logger = logging.getLogger(__name__)
 
@@ -19,6 +32,40 @@ def _get_engine(db_config: dict | None = None):
     return get_engine(db_config)
 
 
+# get_multi_<kind> batches per inspector and schema: the first per-table call
+# reflects the whole schema in one round, later tables are served from memory.
+# Keyed on the inspector, so these expire with it (SCHEMA_CACHE_TTL) and
+# clear_reflection_cache() drops them as well.
+_prefetched: "weakref.WeakKeyDictionary[Any, dict[tuple[str, str], dict | None]]" = weakref.WeakKeyDictionary()
+_prefetch_lock = threading.Lock()
+
+
+def _reflect(inspector, kind: str, table_name: str, schema_name: str) -> Any:
+    """inspector.get_<kind> for one table, answered from a schema-wide batch when possible."""
+    key = (kind, schema_name)
+    with _prefetch_lock:
+        batches = _prefetched.setdefault(inspector, {})
+        missing = key not in batches
+    # Fetched outside the lock so describe_table's concurrent probes of
+    # different kinds do not queue behind each other; a racing duplicate
+    # fetch of the same kind is harmless.
+    if missing:
+        try:
+            fetched = getattr(inspector, f"get_multi_{kind}")(schema=schema_name)
+        except Exception as exc:
+            logger.debug("get_multi_%s failed for schema %s: %s", kind, schema_name, exc)
+            fetched = None
+        with _prefetch_lock:
+            batches.setdefault(key, fetched)
+    batch = batches[key]
+    if batch is not None:
+        # SQLAlchemy keys the default schema as None
+        hit = batch.get((schema_name, table_name), batch.get((None, table_name)))
+        if hit is not None:
+            return hit
+    return getattr(inspector, f"get_{kind}")(table_name, schema=schema_name)
+
+
 def _default_schema(engine) -> str:
     """Return default schema name for the engine type."""
     if isinstance(engine, DuckDBEngine):
@@ -42,16 +89,16 @@ def list_tables(schema_name: str = "", db_config_json: str = "{}") -> str:
     Returns:
         JSON list of table names.
     """
-    db_config = json.loads(db_config_json) if db_config_json else {}
+    db_config = parse_db_config(db_config_json)
     engine = _get_engine(db_config)
     schema_name = schema_name or _default_schema(engine)
     inspector = get_inspector(engine)
     try:
         tables = inspector.get_table_names(schema=schema_name)
-        return json.dumps({"schema": schema_name, "tables": tables})
+        return dump({"schema": schema_name, "tables": tables})
     except Exception as exc:
         logger.error("list_tables failed: %s", exc)
-        return json.dumps({"error": str(exc)})
+        return dump({"error": str(exc)})
 
 
 # ---------------------------------------------------------------------------
@@ -69,14 +116,14 @@ def list_all_schemas(db_config_json: str = "{}") -> str:
     Returns:
         JSON list of schema names.
     """
-    db_config = json.loads(db_config_json) if db_config_json else {}
+    db_config = parse_db_config(db_config_json)
     engine = _get_engine(db_config)
     try:
         schemas = list_schemas(engine)
-        return json.dumps({"schemas": schemas})
+        return dump({"schemas": schemas})
     except Exception as exc:
         logger.error("list_all_schemas failed: %s", exc)
-        return json.dumps({"error": str(exc)})
+        return dump({"error": str(exc)})
 
 
 # ---------------------------------------------------------------------------
@@ -97,13 +144,13 @@ def get_columns(table_name: str, schema_name: str = "", db_config_json: str = "{
     Returns:
         JSON object with column metadata.
     """
-    db_config = json.loads(db_config_json) if db_config_json else {}
+    db_config = parse_db_config(db_config_json)
     engine = _get_engine(db_config)
     schema_name = schema_name or _default_schema(engine)
     inspector = get_inspector(engine)
     try:
-        columns = inspector.get_columns(table_name, schema=schema_name)
-        pk_constraint = inspector.get_pk_constraint(table_name, schema=schema_name)
+        columns = _reflect(inspector, "columns", table_name, schema_name)
+        pk_constraint = _reflect(inspector, "pk_constraint", table_name, schema_name)
         pk_cols = set(pk_constraint.get("constrained_columns", []))
 
         result: list[dict[str, Any]] = []
@@ -115,10 +162,10 @@ def get_columns(table_name: str, schema_name: str = "", db_config_json: str = "{
                 "default": str(col.get("default")) if col.get("default") is not None else None,
                 "is_primary_key": col["name"] in pk_cols,
             })
-        return json.dumps({"table": table_name, "schema": schema_name, "columns": result})
+        return dump({"table": table_name, "schema": schema_name, "columns": result})
     except Exception as exc:
         logger.error("get_columns failed for %s: %s", table_name, exc)
-        return json.dumps({"error": str(exc)})
+        return dump({"error": str(exc)})
 
 
 # ---------------------------------------------------------------------------
@@ -138,12 +185,12 @@ def get_foreign_keys(table_name: str, schema_name: str = "", db_config_json: str
     Returns:
         JSON list of foreign key definitions.
     """
-    db_config = json.loads(db_config_json) if db_config_json else {}
+    db_config = parse_db_config(db_config_json)
     engine = _get_engine(db_config)
     schema_name = schema_name or _default_schema(engine)
     inspector = get_inspector(engine)
     try:
-        fks = inspector.get_foreign_keys(table_name, schema=schema_name)
+        fks = _reflect(inspector, "foreign_keys", table_name, schema_name)
         result = []
         for fk in fks:
             for local_col, ref_col in zip(
@@ -157,10 +204,10 @@ def get_foreign_keys(table_name: str, schema_name: str = "", db_config_json: str
                     "ref_column": ref_col,
                     "name": fk.get("name"),
                 })
-        return json.dumps({"table": table_name, "foreign_keys": result})
+        return dump({"table": table_name, "foreign_keys": result})
     except Exception as exc:
         logger.error("get_foreign_keys failed for %s: %s", table_name, exc)
-        return json.dumps({"error": str(exc)})
+        return dump({"error": str(exc)})
 
 
 # ---------------------------------------------------------------------------
@@ -180,17 +227,17 @@ def get_constraints(table_name: str, schema_name: str = "", db_config_json: str
     Returns:
         JSON object with pk, unique constraints, check constraints, and indexes.
     """
-    db_config = json.loads(db_config_json) if db_config_json else {}
+    db_config = parse_db_config(db_config_json)
     engine = _get_engine(db_config)
     schema_name = schema_name or _default_schema(engine)
     inspector = get_inspector(engine)
     try:
-        pk = inspector.get_pk_constraint(table_name, schema=schema_name)
-        unique = inspector.get_unique_constraints(table_name, schema=schema_name)
-        check = inspector.get_check_constraints(table_name, schema=schema_name)
-        indexes = inspector.get_indexes(table_name, schema=schema_name)
+        pk = _reflect(inspector, "pk_constraint", table_name, schema_name)
+        unique = _reflect(inspector, "unique_constraints", table_name, schema_name)
+        check = _reflect(inspector, "check_constraints", table_name, schema_name)
+        indexes = _reflect(inspector, "indexes", table_name, schema_name)
 
-        return json.dumps({
+        return dump({
             "table": table_name,
             "primary_key": pk,
             "unique_constraints": unique,
@@ -199,7 +246,7 @@ def get_constraints(table_name: str, schema_name: str = "", db_config_json: str
         })
     except Exception as exc:
         logger.error("get_constraints failed for %s: %s", table_name, exc)
-        return json.dumps({"error": str(exc)})
+        return dump({"error": str(exc)})
 
 
 # ---------------------------------------------------------------------------
@@ -207,31 +254,78 @@ def get_constraints(table_name: str, schema_name: str = "", db_config_json: str
 # ---------------------------------------------------------------------------
 
 @tool
-def get_table_row_count(table_name: str, schema_name: str = "", db_config_json: str = "{}") -> str:
+def get_table_row_count(
+    table_name: str,
+    schema_name: str = "",
+    db_config_json: str = "{}",
+    exact: bool = False,
+) -> str:
     """
-    Get the approximate row count for a table using a fast query.
+    Get the approximate row count for a table from catalog statistics.
 
     Args:
         table_name: The table to count.
         schema_name: The schema containing the table (leave empty for default).
         db_config_json: JSON string with optional db connection config.
+        exact: Run COUNT(*) instead of reading the estimate (full table scan).
 
     Returns:
-        JSON object with row count.
+        JSON object with row count and whether it is exact.
     """
-    db_config = json.loads(db_config_json) if db_config_json else {}
+    db_config = parse_db_config(db_config_json)
     engine = _get_engine(db_config)
     schema_name = schema_name or _default_schema(engine)
     try:
-        with engine.connect() as conn:
-            sql = f'SELECT COUNT(*) FROM "{schema_name}"."{table_name}"'
-            result = conn.execute(sql)
-            rows = result.fetchone()
+        count = None if exact else estimate_row_count(engine, schema_name, table_name)
+        if count is None:
+            # Exact path, also taken when the table has never been analyzed
+            exact = True
+            qualified = quote_table(engine, schema_name, table_name)
+            with engine.connect() as conn:
+                rows = conn.execute(text(f"SELECT COUNT(*) FROM {qualified}")).fetchone()
             count = rows[0] if rows else 0
-        return json.dumps({"table": table_name, "row_count": count})
+        return dump({"table": table_name, "row_count": count, "exact": exact})
     except Exception as exc:
         logger.error("get_table_row_count failed for %s: %s", table_name, exc)
-        return json.dumps({"error": str(exc)})
+        return dump({"error": str(exc)})
+
+
+# ---------------------------------------------------------------------------
+# Tool: describe_table
+# ---------------------------------------------------------------------------
+
+@tool
+def describe_table(table_name: str, schema_name: str = "", db_config_json: str = "{}") -> str:
+    """
+    Get columns, foreign keys, constraints and row count for a table in one call.
+
+    The four lookups are independent and run concurrently, each on its own
+    pooled connection, so the call takes about as long as the slowest one.
+
+    Args:
+        table_name: The table to inspect.
+        schema_name: The schema containing the table (leave empty for default).
+        db_config_json: JSON string with optional db connection config.
+
+    Returns:
+        JSON object with the results of get_columns, get_foreign_keys,
+        get_constraints and get_table_row_count for the table.
+    """
+    probes = {
+        "columns": get_columns,
+        "foreign_keys": get_foreign_keys,
+        "constraints": get_constraints,
+        "row_count": get_table_row_count,
+    }
+
+    def _one(probe) -> Any:
+        return json.loads(probe.func(
+            table_name, schema_name=schema_name, db_config_json=db_config_json,
+        ))
+
+    with ThreadPoolExecutor(max_workers=len(probes)) as pool:
+        results = list(pool.map(_one, probes.values()))
+    return dump({"table": table_name, **dict(zip(probes, results))})
 
 
 # ---------------------------------------------------------------------------
@@ -245,4 +339,5 @@ SCHEMA_TOOLS = [
     get_foreign_keys,
     get_constraints,
     get_table_row_count,
+    describe_table,
 ]
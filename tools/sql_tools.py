@@ -4,15 +4,89 @@ Used by the Conversational Chat Agent.
 """
 from __future__ import annotations
 
-import json
+import functools
 import logging
+import re
 
+import anyio
+import anyio.to_thread
 from langchain_core.tools import tool
-
-from core.db_connectors import DuckDBEngine, get_engine
+from sqlalchemy import text
+
+from core.db_connectors import (
+    POOL_MAX_OVERFLOW,
+    POOL_SIZE,
+    DuckDBEngine,
+    get_duckdb_conn,
+    get_engine,
+    parse_db_config,
+    quote_table,
+)
+from tools._envelope import dump
 
 logger = logging.getLogger(__name__)
 
+MAX_QUERY_ROWS = 100
+
+_READ_ONLY_PREFIX = re.compile(r"\s*(?:SELECT|WITH)\b", re.IGNORECASE)
+
+# Lexical tokens as Postgres and DuckDB split them, just far enough to tell a
+# statement-separating ";" from one inside a literal, identifier or comment.
+# Escape strings honour backslashes; plain strings only double quotes.
+_SQL_TOKEN = re.compile(
+    r"""
+      [Ee]'(?:[^'\\]|\\.|'')*'                        # escape string
+    | '(?:[^']|'')*'                                  # string literal
+    | "(?:[^"]|"")*"                                  # quoted identifier
+    | --[^\n]*                                        # line comment
+    | /\*.*?\*/                                       # block comment
+    | \$(?P<tag>(?:[A-Za-z_]\w*)?)\$.*?\$(?P=tag)\$   # dollar-quoted string
+    | [\w$]+                                          # word, number or $n parameter
+    | \s+
+    | .
+    """,
+    re.DOTALL | re.VERBOSE,
+)
+
+# The installed drivers (psycopg2, duckdb) are blocking, so async agents run
+# these tools on worker threads. At most as many run at once as an engine can
+# hand out connections; further calls wait on the event loop rather than
+# parking a thread on pool checkout.
+_DB_THREADS = anyio.CapacityLimiter(POOL_SIZE + POOL_MAX_OVERFLOW)
+
+
+def _single_statement(sql: str) -> str | None:
+    """
+    sql without its trailing ";" separators, or None if it holds more than one
+    statement. Semicolons inside literals, quoted identifiers and comments
+    don't count.
+    """
+    end = None
+    for match in _SQL_TOKEN.finditer(sql):
+        token = match.group()
+        if token == ";":
+            if end is None:
+                end = match.start()
+        elif end is not None and not (token.isspace() or token.startswith(("--", "/*"))):
+            return None
+    return (sql if end is None else sql[:end]).strip()
+
+
+def _fetch_limited(engine, sql: str, limit: int) -> tuple[list[str], list[tuple]]:
+    """
+    Run ``sql LIMIT <limit>`` with the limit as a bound parameter.
+
+    The DuckDB wrapper connection does not bind parameters, so DuckDB goes
+    through the native relation API, which adds the limit to the query plan.
+    """
+    if isinstance(engine, DuckDBEngine):
+        rel = get_duckdb_conn(engine).sql(sql).limit(limit)
+        return rel.columns, rel.fetchall()
+    with engine.connect() as conn:
+        result = conn.execute(text(f"{sql} LIMIT :limit"), {"limit": limit})
+        # Row is not a tuple subclass; plain tuples encode as JSON arrays
+        return list(result.keys()), [tuple(row) for row in result]
+
 
 @tool
 def execute_query(sql: str, db_config_json: str = "{}") -> str:
@@ -20,32 +94,49 @@ def execute_query(sql: str, db_config_json: str = "{}") -> str:
     Execute a read-only SQL SELECT query against the database and return results.
 
     Args:
-        sql: A valid SQL SELECT statement to execute.
+        sql: A single valid SQL SELECT statement to execute.
         db_config_json: JSON string with optional db connection config.
 
     Returns:
-        JSON with rows (list of dicts) and column names, capped at 100 rows.
+        JSON with column names and rows, each row an array of values in
+        column order, capped at 100 rows.
     """
-    db_config = json.loads(db_config_json) if db_config_json else {}
-    normalized = sql.strip().upper()
-    if not normalized.startswith("SELECT") and not normalized.startswith("WITH"):
-        return json.dumps({"error": "Only SELECT/WITH queries are permitted."})
+    db_config = parse_db_config(db_config_json)
+    if not _READ_ONLY_PREFIX.match(sql):
+        return dump({"error": "Only SELECT/WITH queries are permitted."})
+    # Inside the subquery wrapper below (or as a DuckDB relation) a single
+    # statement cannot modify data: DML, data-modifying CTEs and SELECT INTO
+    # fail to parse there. The remaining risk is a ")"-closing payload that
+    # stacks a second statement.
+    body = _single_statement(sql)
+    if body is None:
+        return dump({"error": "Only a single SELECT/WITH statement is permitted."})
 
     engine = get_engine(db_config)
+    # Push the cap into the statement so the engine stops after one row past
+    # it, rather than computing the full result and discarding it client-side.
+    if isinstance(engine, DuckDBEngine):
+        # The relation API limits the query as written, which keeps duplicate
+        # output names (a subquery would rename them to e.g. id_1); DuckDB
+        # rejects DML inside a SELECT/WITH statement anyway.
+        capped = body
+    else:
+        # The newline keeps a trailing "--" comment from swallowing the paren;
+        # ':' is escaped so text() leaves literals like '10:30' unbound.
+        capped = f"SELECT * FROM ({body}\n) AS _capped".replace(":", "\\:")
     try:
-        with engine.connect() as conn:
-            result = conn.execute(sql)
-            columns = list(result.keys())
-            rows = [dict(zip(columns, row)) for row in result.fetchmany(100)]
-        return json.dumps({
+        columns, fetched = _fetch_limited(engine, capped, MAX_QUERY_ROWS + 1)
+        rows = fetched[:MAX_QUERY_ROWS]
+        return dump({
             "columns": columns,
             "rows": rows,
             "row_count": len(rows),
-            "capped_at": 100,
-        }, default=str)
+            "capped_at": MAX_QUERY_ROWS,
+            "truncated": len(fetched) > MAX_QUERY_ROWS,
+        })
     except Exception as exc:
         logger.error("execute_query failed: %s", exc)
-        return json.dumps({"error": str(exc)})
+        return dump({"error": str(exc)})
 
 
 @tool
@@ -65,26 +156,35 @@ def get_sample_rows(
         db_config_json: JSON string with optional db connection config.
 
     Returns:
-        JSON with sample rows and column names.
+        JSON with column names and sample rows as arrays in column order.
     """
-    db_config = json.loads(db_config_json) if db_config_json else {}
+    db_config = parse_db_config(db_config_json)
     limit = min(limit, 20)
     engine = get_engine(db_config)
 
     if not schema_name:
         schema_name = "main" if isinstance(engine, DuckDBEngine) else "public"
 
+    qualified = quote_table(engine, schema_name, table_name)
     try:
-        with engine.connect() as conn:
-            result = conn.execute(
-                f'SELECT * FROM "{schema_name}"."{table_name}" LIMIT {limit}'
-            )
-            columns = list(result.keys())
-            rows = [dict(zip(columns, row)) for row in result.fetchall()]
-        return json.dumps({"table": table_name, "columns": columns, "rows": rows}, default=str)
+        columns, fetched = _fetch_limited(engine, f"SELECT * FROM {qualified}", max(limit, 0))
+        return dump({"table": table_name, "columns": columns, "rows": fetched})
     except Exception as exc:
         logger.error("get_sample_rows failed: %s", exc)
-        return json.dumps({"error": str(exc)})
+        return dump({"error": str(exc)})
+
+
+def _offloaded(fn):
+    @functools.wraps(fn)
+    async def run(*args, **kwargs):
+        return await anyio.to_thread.run_sync(
+            functools.partial(fn, *args, **kwargs), limiter=_DB_THREADS,
+        )
+    return run
+
 
+# Used by ainvoke(); invoke() keeps calling the sync functions directly.
+execute_query.coroutine = _offloaded(execute_query.func)
+get_sample_rows.coroutine = _offloaded(get_sample_rows.func)
 
 SQL_TOOLS = [execute_query, get_sample_rows]